@@ -1,13 +1,11 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import folium
-from streamlit_folium import st_folium
 import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, date
+from typing import NamedTuple
 import warnings
 import os
 
@@ -27,22 +25,34 @@ if USE_SUPABASE:
         USE_SUPABASE = False
 
 if not USE_SUPABASE:
-    from auth_inmemory import AuthStore, add_user, validate_user, add_waste_log, get_user_logs
+    from auth_inmemory import (AuthStore, add_user, validate_user,
+                               add_waste_log, get_user_logs, get_user_logs_array)
 else:
+    # Supabase returns WasteLog objects only; no SoA array fast path
+    get_user_logs_array = None
+
     # Create a dummy AuthStore class for Supabase mode
     class AuthStore:
         def __init__(self):
             pass
+from bia_core import CO2_PER_KWH_KG
 from bia_core.data_io import load_curated_data
 from bia_core.schemas import UserProfile, WasteLog
 from bia_core.features import create_forecast_features
-from bia_core.models import DeterministicModel, SARIMAModel, ModelSelector
-from bia_core.finance import FinanceCalculator
+from bia_core.finance import FinanceCalculator, vectorized_npv, NPV_PARAM_COLUMNS, warm_cashflow_kernel
 from bia_core.eval import calculate_mape, backtest_model
-from bia_core.maps import create_facilities_map
-from bia_core.utils import format_currency, format_number, validate_range
+from bia_core.utils import format_currency, format_number, validate_range, downsample_lttb
+
+# Heavy modules (plotly, folium/streamlit_folium, and the statsmodels-backed
+# models) are imported lazily inside the tabs that need them, keeping
+# login-page cold start light.
 
-warnings.filterwarnings('ignore')
+# Silence only the known-noisy categories instead of blanket-ignoring;
+# a narrow filter list is cheaper to evaluate on hot forecasting paths
+# and keeps genuinely useful deprecations visible
+warnings.filterwarnings('ignore', category=FutureWarning, module='statsmodels')
+warnings.filterwarnings('ignore', category=UserWarning, module='statsmodels')
+warnings.filterwarnings('ignore', category=FutureWarning, module='pandas')
 
 # Language translations
 TRANSLATIONS = {
@@ -107,7 +117,8 @@ TRANSLATIONS = {
         "byproduct_help": "Revenue from digestate/compost sales",
         "with_credits": "With Credits",
         "without_credits": "Without Credits",
-        "byproduct_revenue": "Byproduct Revenue"
+        "byproduct_revenue": "Byproduct Revenue",
+        "apply_params": "Apply Parameters"
     },
     "hi": {
         "app_title": "BIA - जैव-ऊर्जा बुद्धिमत्ता अनुप्रयोग",
@@ -170,14 +181,19 @@ TRANSLATIONS = {
         "byproduct_help": "डाइजेस्टेट/कंपोस्ट बिक्री से राजस्व",
         "with_credits": "क्रेडिट के साथ",
         "without_credits": "क्रेडिट के बिना",
-        "byproduct_revenue": "उप-उत्पाद राजस्व"
+        "byproduct_revenue": "उप-उत्पाद राजस्व",
+        "apply_params": "मापदंड लागू करें"
     }
 }
 
 def t(key):
-    """Translation function"""
+    """Translation function; called for every rendered string, so keep the
+    fast path to a single dict lookup on the active language table."""
     language = st.session_state.get('language', 'en')
-    return TRANSLATIONS.get(language, {}).get(key, key)
+    table = TRANSLATIONS.get(language)
+    if table is None:
+        table = TRANSLATIONS['en']
+    return table.get(key, key)
 
 # Page configuration
 st.set_page_config(
@@ -190,6 +206,16 @@ st.set_page_config(
 # Constants
 SUPPORTED_CITIES = ["Ahmedabad", "Gandhinagar", "Indore", "Delhi", "Mumbai", "Pune", "Bengaluru", "Chennai"]
 WASTE_TYPES = ["organic", "industrial", "agricultural"]
+MAX_PLOT_POINTS = 2000  # Downsample longer series before plotting
+MAX_TABLE_ROWS = 500    # Show only recent logs in tables by default
+
+# Dark-theme overrides, precomputed once at import time
+DARK_THEME_CSS = """
+<style>
+.stApp { background-color: #0E1117; }
+.stSidebar { background-color: #262730; }
+</style>
+"""
 
 # Initialize auth store
 auth_store = AuthStore()
@@ -206,6 +232,274 @@ def init_session_state():
         st.session_state.language = 'en'
     if 'theme' not in st.session_state:
         st.session_state.theme = 'light'
+    if 'logs_version' not in st.session_state:
+        st.session_state.logs_version = 0
+    if 'kernel_warmed' not in st.session_state:
+        # Compile the cashflow kernel once so slider reruns don't pay for it
+        warm_cashflow_kernel()
+        st.session_state.kernel_warmed = True
+
+@st.cache_data(ttl=60, show_spinner=False)
+def get_logs_df(username: str, version: int) -> pd.DataFrame:
+    """Materialize waste logs as a DataFrame, cached per logs version.
+
+    The version counter is bumped whenever a log is added, so sidebar
+    reruns reuse the cached frame instead of rebuilding it from the log
+    list on every interaction. The short TTL covers writes the counter
+    cannot see, such as another session on the Supabase backend.
+    """
+    logs = get_user_logs(username)
+    return pd.DataFrame({
+        # datetime64 column so sorts and date filters run vectorized
+        # instead of dispatching Python comparisons per row
+        'date': pd.to_datetime([log.date for log in logs]),
+        'waste_tons': np.fromiter((log.waste_tons for log in logs),
+                                  dtype=np.float64, count=len(logs))
+    })
+
+class LogStats(NamedTuple):
+    """Aggregate statistics over a user's waste logs"""
+    total: float
+    today: float
+    unique_days: int
+    avg_daily: float
+    dates: np.ndarray
+    tons: np.ndarray
+
+@st.cache_data(ttl=60, show_spinner=False)
+def compute_log_stats(username: str, version: int) -> LogStats:
+    """Compute all log reductions in one NumPy pass, cached per logs version.
+
+    Replaces the separate sum()/set() generator traversals the tabs used
+    to run on every rerun with a single vectorized aggregation.
+    """
+    if get_user_logs_array is not None:
+        # In-memory backend keeps SoA buffers; no per-log attribute walk
+        dates, tons = get_user_logs_array(username)
+    else:
+        logs = get_user_logs(username)
+        tons = np.fromiter((log.waste_tons for log in logs),
+                           dtype=np.float64, count=len(logs))
+        dates = np.array([log.date for log in logs], dtype='datetime64[D]')
+
+    total = float(tons.sum())
+    today = float(tons[dates == np.datetime64(date.today())].sum())
+    unique_days = int(np.unique(dates).size)
+    avg_daily = total / max(unique_days, 1)
+
+    return LogStats(total, today, unique_days, avg_daily, dates, tons)
+
+@st.cache_data(show_spinner=False)
+def cached_features(username: str, version: int) -> pd.DataFrame:
+    """Forecast feature matrix, built once per logs version"""
+    df_logs = get_logs_df(username, version).sort_values('date')
+    return create_forecast_features(df_logs)
+
+@st.cache_resource(show_spinner="Fitting forecast models…")
+def fit_forecast_models(username: str, version: int):
+    """Fit both forecasting models once per logs version.
+
+    SARIMA fitting is the expensive part of the forecast tab; caching on
+    the logs version means unrelated slider changes skip the refit.
+    """
+    from bia_core.models import DeterministicModel, SARIMAModel
+
+    forecast_features = cached_features(username, version)
+
+    det_model = DeterministicModel()
+    sarima_model = SARIMAModel()
+
+    # The fits are independent and statsmodels releases the GIL inside
+    # its LAPACK calls, so running them on two threads overlaps the work
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        fit_det = pool.submit(det_model.fit, forecast_features)
+        fit_sarima = pool.submit(sarima_model.fit, forecast_features)
+        fit_det.result()
+        fit_sarima.result()
+
+    return det_model, sarima_model, forecast_features
+
+@st.cache_data(show_spinner="Backtesting models…")
+def backtest_forecast_models(username: str, version: int):
+    """Backtest both models once per logs version.
+
+    Fresh model instances are used so the backtest's internal refits
+    don't disturb the cached fitted models.
+    """
+    from bia_core.models import DeterministicModel, SARIMAModel
+
+    _, _, forecast_features = fit_forecast_models(username, version)
+
+    # Independent backtests run in parallel, same as the fits above
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        fut_det = pool.submit(backtest_model, DeterministicModel(), forecast_features)
+        fut_sarima = pool.submit(backtest_model, SARIMAModel(), forecast_features)
+        det_mape = fut_det.result()
+        sarima_mape = fut_sarima.result()
+
+    best_name = 'DeterministicModel' if det_mape <= sarima_mape else 'SARIMAModel'
+
+    return det_mape, sarima_mape, best_name
+
+# Sidebar parameters consumed by FinanceCalculator, in constructor order
+FINANCE_PARAM_KEYS = ('yield_rate', 'capacity_factor', 'tariff', 'opex_per_ton',
+                      'fixed_opex', 'capex', 'discount_rate',
+                      'carbon_credit_price', 'byproduct_price', 'enable_byproduct')
+
+def finance_params_tuple(params):
+    """Hashable cache key for the current finance parameters"""
+    return tuple(params[key] for key in FINANCE_PARAM_KEYS)
+
+@st.cache_resource
+def make_calc(params_tuple):
+    """One FinanceCalculator per parameter combination, shared across tabs"""
+    return FinanceCalculator(*params_tuple)
+
+@st.cache_data
+def cached_cashflows(params_tuple, avg_daily_waste: float, horizon_years: int):
+    """Cashflow list cached per (parameters, waste, horizon) combination"""
+    return make_calc(params_tuple).calculate_cashflows(avg_daily_waste, horizon_years)
+
+@st.cache_data
+def cached_cashflow_arrays(params_tuple, avg_daily_waste: float, horizon_years: int):
+    """Columnar cashflow arrays, cached on the same key as the list view"""
+    return make_calc(params_tuple).calculate_cashflow_arrays(avg_daily_waste,
+                                                             horizon_years)
+
+@st.cache_data
+def npv_bundle(params_tuple, avg_daily_waste: float, horizon_years: int):
+    """(NPV, payback, ROI) for one parameter set, cached as a unit"""
+    calc = make_calc(params_tuple)
+    return (calc.calculate_npv(avg_daily_waste, horizon_years),
+            calc.calculate_payback(avg_daily_waste, horizon_years),
+            calc.calculate_roi(avg_daily_waste, horizon_years))
+
+# Tornado-chart parameters: display label -> NPV_PARAM_COLUMNS name
+SENSITIVITY_PARAMS = (
+    ('Yield Rate', 'yield_rate'),
+    ('Tariff', 'tariff'),
+    ('OPEX per ton', 'opex_per_ton'),
+    ('CAPEX', 'capex'),
+    ('Discount Rate', 'discount_rate'),
+)
+
+@st.cache_data
+def sensitivity_npvs(params_tuple, avg_daily_waste: float, horizon_years: int):
+    """±15% NPV sweep for the tornado chart, cached per parameter set.
+
+    Builds one scenario matrix (base case plus high/low rows per swept
+    parameter) and prices every scenario in a single vectorized NPV pass.
+    Returns parallel arrays sorted by absolute impact, largest first.
+    """
+    param_index = {name: i for i, name in enumerate(NPV_PARAM_COLUMNS)}
+
+    # finance_params_tuple follows NPV_PARAM_COLUMNS order
+    base_row = np.array(params_tuple, dtype=np.float64)
+
+    n_params = len(SENSITIVITY_PARAMS)
+    col_idx = np.array([param_index[key] for _, key in SENSITIVITY_PARAMS])
+    base_values = base_row[col_idx]
+
+    # Rows: base case, then alternating (+15%, -15%) per parameter
+    scenarios = np.tile(base_row, (1 + 2 * n_params, 1))
+    scenarios[1 + 2 * np.arange(n_params), col_idx] = base_values * 1.15
+    scenarios[2 + 2 * np.arange(n_params), col_idx] = base_values * 0.85
+
+    npvs = vectorized_npv(scenarios, avg_daily_waste, horizon_years)
+
+    # Rows 1,3,5,... are +15%, rows 2,4,6,... are -15%
+    param_names = np.array([label for label, _ in SENSITIVITY_PARAMS])
+    npv_high = npvs[1::2]
+    npv_low = npvs[2::2]
+    impacts = npv_high - npv_low
+
+    order = np.argsort(-np.abs(impacts))
+    return param_names[order], impacts[order], npv_low[order], npv_high[order]
+
+@st.cache_data
+def build_tornado(params_tuple, avg_daily_waste: float, horizon_years: int):
+    """Tornado figure and results table, cached per parameter set.
+
+    Reruns that don't change the finance parameters (tab switches, new
+    log entries) reuse the prebuilt figure instead of reassembling it.
+    """
+    import plotly.graph_objects as go
+
+    param_names, impacts, npv_low, npv_high = sensitivity_npvs(
+        params_tuple, avg_daily_waste, horizon_years)
+
+    fig_tornado = go.Figure(go.Bar(
+        y=param_names,
+        x=impacts,
+        orientation='h',
+        marker_color=np.where(impacts < 0, 'red', 'green')
+    ))
+
+    fig_tornado.update_layout(
+        title="NPV Sensitivity Analysis (±15% parameter change)",
+        xaxis_title="NPV Impact (₹)",
+        yaxis_title="Parameter"
+    )
+
+    sens_df = pd.DataFrame({
+        'Parameter': param_names,
+        'NPV Impact': impacts,
+        'NPV Low (-15%)': npv_low,
+        'NPV High (+15%)': npv_high
+    })
+
+    # One batched formatting pass over the currency columns; cached with
+    # the figure so it never reruns per-metric
+    inr_columns = ['NPV Impact', 'NPV Low (-15%)', 'NPV High (+15%)']
+    sens_df[inr_columns] = sens_df[inr_columns].map('₹{:,.0f}'.format)
+
+    return fig_tornado, sens_df
+
+@dataclass(frozen=True)
+class DerivedMetrics:
+    """Energy and environmental scalars derived from logs and parameters"""
+    gross_kwh: float
+    today_kwh: float
+    revenue_potential: float
+    co2_tons: float
+    trees: float
+
+@st.cache_data
+def derived_metrics(params_tuple, total_waste: float, today_waste: float) -> DerivedMetrics:
+    """Compute the kWh/revenue/CO2/trees scalar chain once for all tabs"""
+    yield_rate, capacity_factor, tariff = params_tuple[:3]
+
+    gross_kwh = total_waste * yield_rate * capacity_factor
+    today_kwh = today_waste * yield_rate * capacity_factor
+    revenue_potential = gross_kwh * tariff
+    co2_tons = gross_kwh * CO2_PER_KWH_KG / 1000
+    trees = 50 * co2_tons
+
+    return DerivedMetrics(gross_kwh, today_kwh, revenue_potential, co2_tons, trees)
+
+@st.cache_data
+def df_to_csv_bytes(df: pd.DataFrame) -> bytes:
+    """CSV bytes for download buttons, cached so reruns skip re-encoding"""
+    return df.to_csv(index=False, date_format='%Y-%m-%d').encode('utf-8')
+
+@st.cache_data
+def facilities_for_city(city: str) -> pd.DataFrame:
+    """City-filtered facilities, cached so tab reruns skip the table scan"""
+    facilities = load_curated_data()['facilities']
+    groups = {c: g.reset_index(drop=True)
+              for c, g in facilities.groupby('city', observed=True)}
+    return groups.get(city, facilities.iloc[0:0])
+
+@st.cache_resource
+def build_facilities_map_html(city: str) -> str:
+    """Render the folium map to HTML once per city.
+
+    Caching the finished HTML string (rather than the Map object) means
+    reruns skip folium's render pass entirely, which is the dominant
+    cost of showing the map.
+    """
+    from bia_core.maps import create_facilities_map
+    return create_facilities_map(facilities_for_city(city), city).get_root().render()
 
 def login_signup_page():
     """Handle login and signup"""
@@ -286,14 +580,10 @@ def sidebar_controls():
             st.session_state.theme = theme
             st.rerun()
     
-    # Apply theme styling
+    # Apply theme styling (the element must be re-emitted every rerun to
+    # persist, but the precomputed constant avoids rebuilding the string)
     if st.session_state.theme == "dark":
-        st.markdown("""
-        <style>
-        .stApp { background-color: #0E1117; }
-        .stSidebar { background-color: #262730; }
-        </style>
-        """, unsafe_allow_html=True)
+        st.markdown(DARK_THEME_CSS, unsafe_allow_html=True)
     
     # User info
     if st.session_state.user_profile:
@@ -308,84 +598,89 @@ def sidebar_controls():
     
     st.sidebar.divider()
     
-    # Basic parameters
-    st.sidebar.subheader(t("technical_params"))
-    
-    yield_rate = st.sidebar.slider(
-        t("yield_rate"), 
-        min_value=100.0, max_value=2000.0, value=800.0, step=50.0,
-        help="Energy yield per ton of waste"
-    )
-    
-    capacity_factor = st.sidebar.slider(
-        t("capacity_factor"), 
-        min_value=30.0, max_value=95.0, value=85.0, step=5.0,
-        help="Plant capacity utilization factor"
-    ) / 100
-    
-    st.sidebar.subheader(t("financial_params"))
-    
-    tariff = st.sidebar.slider(
-        t("tariff"), 
-        min_value=2.0, max_value=8.0, value=4.5, step=0.1,
-        help="Electricity selling price"
-    )
-    
-    opex_per_ton = st.sidebar.slider(
-        t("opex_per_ton"), 
-        min_value=200.0, max_value=1000.0, value=500.0, step=50.0,
-        help="Operating expenses per ton of waste"
-    )
-    
-    # Optional Revenue Streams
-    st.sidebar.subheader(f"{t('optional_revenue')} (Optional)")
-    
-    carbon_credit_price = st.sidebar.slider(
-        t("carbon_credits"),
-        min_value=0.0, max_value=1000.0, value=300.0, step=10.0,
-        help=t("carbon_credits_help")
-    )
-    
-    enable_byproduct = st.sidebar.checkbox(
-        t("byproduct_sales"),
-        value=False,
-        help=t("byproduct_help")
-    )
-    
-    byproduct_price = 0.0
-    if enable_byproduct:
-        byproduct_price = st.sidebar.slider(
+    # Parameter controls live in a form so dragging several sliders
+    # costs one rerun on Apply instead of one rerun per tick
+    with st.sidebar.form("parameter_form", border=False):
+        st.subheader(t("technical_params"))
+
+        yield_rate = st.slider(
+            t("yield_rate"),
+            min_value=100.0, max_value=2000.0, value=800.0, step=50.0,
+            help="Energy yield per ton of waste"
+        )
+
+        capacity_factor = st.slider(
+            t("capacity_factor"),
+            min_value=30.0, max_value=95.0, value=85.0, step=5.0,
+            help="Plant capacity utilization factor"
+        ) / 100
+
+        st.subheader(t("financial_params"))
+
+        tariff = st.slider(
+            t("tariff"),
+            min_value=2.0, max_value=8.0, value=4.5, step=0.1,
+            help="Electricity selling price"
+        )
+
+        opex_per_ton = st.slider(
+            t("opex_per_ton"),
+            min_value=200.0, max_value=1000.0, value=500.0, step=50.0,
+            help="Operating expenses per ton of waste"
+        )
+
+        # Optional Revenue Streams
+        st.subheader(f"{t('optional_revenue')} (Optional)")
+
+        carbon_credit_price = st.slider(
+            t("carbon_credits"),
+            min_value=0.0, max_value=1000.0, value=300.0, step=10.0,
+            help=t("carbon_credits_help")
+        )
+
+        enable_byproduct = st.checkbox(
+            t("byproduct_sales"),
+            value=False,
+            help=t("byproduct_help")
+        )
+
+        # Always rendered inside the form; only charged when enabled
+        byproduct_price_input = st.slider(
             t("byproduct_price"),
             min_value=0.0, max_value=500.0, value=50.0, step=5.0,
             help=t("byproduct_help")
         )
-    
-    # Advanced options in expander
-    with st.sidebar.expander(t("advanced_options")):
-        fixed_opex = st.number_input(
-            t("fixed_opex"), 
-            min_value=0.0, max_value=100.0, value=10.0, step=1.0,
-            help="Fixed annual operating expenses"
-        ) * 100000  # Convert to rupees
-        
-        capex = st.number_input(
-            t("capex"), 
-            min_value=1.0, max_value=100.0, value=25.0, step=1.0,
-            help="Capital expenditure"
-        ) * 10000000  # Convert to rupees
-        
-        discount_rate = st.slider(
-            t("discount_rate"), 
-            min_value=5.0, max_value=20.0, value=12.0, step=0.5,
-            help="Cost of capital"
-        ) / 100
-        
-        horizon_years = st.slider(
-            t("project_horizon"), 
-            min_value=10, max_value=30, value=20, step=1,
-            help="Project lifetime"
-        )
-    
+
+        # Advanced options in expander
+        with st.expander(t("advanced_options")):
+            fixed_opex = st.number_input(
+                t("fixed_opex"),
+                min_value=0.0, max_value=100.0, value=10.0, step=1.0,
+                help="Fixed annual operating expenses"
+            ) * 100000  # Convert to rupees
+
+            capex = st.number_input(
+                t("capex"),
+                min_value=1.0, max_value=100.0, value=25.0, step=1.0,
+                help="Capital expenditure"
+            ) * 10000000  # Convert to rupees
+
+            discount_rate = st.slider(
+                t("discount_rate"),
+                min_value=5.0, max_value=20.0, value=12.0, step=0.5,
+                help="Cost of capital"
+            ) / 100
+
+            horizon_years = st.slider(
+                t("project_horizon"),
+                min_value=10, max_value=30, value=20, step=1,
+                help="Project lifetime"
+            )
+
+        st.form_submit_button(t("apply_params"), use_container_width=True)
+
+    byproduct_price = byproduct_price_input if enable_byproduct else 0.0
+
     st.sidebar.divider()
     
     # Logout button
@@ -433,6 +728,7 @@ def waste_logging_section():
                     waste_tons=waste_amount
                 )
                 add_waste_log(waste_log)
+                st.session_state.logs_version += 1
                 st.success(f"Added {waste_amount} {t('tons')} of waste for {log_date}")
                 st.rerun()
             else:
@@ -459,29 +755,37 @@ def entity_profile_tab():
     
     # Waste logs
     st.subheader("📊 Waste Logs")
-    logs = get_user_logs(st.session_state.username)
-    
-    if logs:
-        df_logs = pd.DataFrame([{
-            'Date': log.date,
-            'Waste (tons)': log.waste_tons
-        } for log in logs])
-        
+    df = get_logs_df(st.session_state.username, st.session_state.logs_version)
+
+    if not df.empty:
+        df_logs = df.rename(columns={'date': 'Date', 'waste_tons': 'Waste (tons)'})
+
         # Summary metrics
+        stats = compute_log_stats(st.session_state.username, st.session_state.logs_version)
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("Total Waste", f"{df_logs['Waste (tons)'].sum():.2f} tons")
+            st.metric("Total Waste", f"{stats.total:.2f} tons")
         with col2:
-            today_waste = df_logs[df_logs['Date'] == date.today()]['Waste (tons)'].sum()
-            st.metric("Today's Waste", f"{today_waste:.2f} tons")
+            st.metric("Today's Waste", f"{stats.today:.2f} tons")
         with col3:
             st.metric("Total Logs", len(df_logs))
         
-        # Logs table
-        st.dataframe(df_logs, use_container_width=True)
-        
-        # Download logs
-        csv = df_logs.to_csv(index=False)
+        # Logs table; render only recent rows by default so long histories
+        # don't serialize the whole frame to the browser every rerun
+        date_column = {'Date': st.column_config.DateColumn('Date')}
+
+        if len(df_logs) > MAX_TABLE_ROWS and not st.checkbox(
+                f"Show all {len(df_logs)} logs", key="show_all_logs"):
+            st.dataframe(df_logs.tail(MAX_TABLE_ROWS), use_container_width=True,
+                         column_config=date_column)
+            st.caption(f"Showing the most recent {MAX_TABLE_ROWS} logs; "
+                       "the CSV download contains the full history.")
+        else:
+            st.dataframe(df_logs, use_container_width=True,
+                         column_config=date_column)
+
+        # Download logs (full history, serialized once per new log)
+        csv = df_to_csv_bytes(df_logs)
         st.download_button(
             label="Download Logs CSV",
             data=csv,
@@ -491,144 +795,166 @@ def entity_profile_tab():
     else:
         st.info("No waste logs found. Add some logs to get started!")
 
-def forecast_tab(params):
-    """Waste trend and forecast"""
-    st.header("📈 Waste Trend & Forecast")
-    
-    logs = get_user_logs(st.session_state.username)
-    
-    if not logs or len(logs) < 2:
-        st.warning("Need at least 2 waste logs to generate forecasts")
-        return
-    
-    # Prepare data
-    df_logs = pd.DataFrame([{
-        'date': log.date,
-        'waste_tons': log.waste_tons
-    } for log in logs])
-    
-    df_logs = df_logs.sort_values('date')
+@st.cache_data
+def plot_ready_logs(username: str, version: int) -> pd.DataFrame:
+    """Sorted logs with cumulative totals, downsampled for plotting.
+
+    Long histories are thinned with LTTB on the backend so only the
+    points worth drawing are shipped to the browser.
+    """
+    df_logs = get_logs_df(username, version).sort_values('date')
     df_logs['cumulative_waste'] = df_logs['waste_tons'].cumsum()
-    
-    # Create forecast features
-    forecast_features = create_forecast_features(df_logs)
-    
-    # Initialize models
-    det_model = DeterministicModel()
-    sarima_model = SARIMAModel()
-    
-    # Fit models
-    det_model.fit(forecast_features)
-    sarima_model.fit(forecast_features)
-    
-    # Generate forecasts
-    forecast_days = 30
+
+    if len(df_logs) > MAX_PLOT_POINTS:
+        x_num = pd.to_datetime(df_logs['date']).astype(np.int64).to_numpy()
+        keep = downsample_lttb(x_num, df_logs['waste_tons'].to_numpy(), MAX_PLOT_POINTS)
+        df_logs = df_logs.iloc[keep]
+
+    return df_logs
+
+@st.cache_data
+def build_trend_figs(username: str, version: int):
+    """Historical and cumulative trend figures, cached per logs version"""
+    import plotly.graph_objects as go
+
+    plot_logs = plot_ready_logs(username, version)
+
+    # WebGL traces keep the DOM small for long histories
+    fig_hist = go.Figure(go.Scattergl(
+        x=plot_logs['date'], y=plot_logs['waste_tons'], mode='lines'
+    ))
+    fig_hist.update_layout(title="Historical Waste Logs",
+                           xaxis_title="Date", yaxis_title="Waste (tons)")
+
+    fig_cum = go.Figure(go.Scattergl(
+        x=plot_logs['date'], y=plot_logs['cumulative_waste'], mode='lines'
+    ))
+    fig_cum.update_layout(title="Cumulative Waste",
+                          xaxis_title="Date", yaxis_title="Cumulative Waste (tons)")
+
+    return fig_hist, fig_cum
+
+@st.cache_data
+def build_forecast_fig(username: str, version: int, forecast_days: int):
+    """Forecast-comparison figure, cached per logs version"""
+    import plotly.graph_objects as go
+
+    plot_logs = plot_ready_logs(username, version)
+    det_model, sarima_model, _ = fit_forecast_models(username, version)
+
     det_forecast = det_model.predict(forecast_days)
     sarima_forecast = sarima_model.predict(forecast_days)
-    
-    # Model selection based on backtest
-    model_selector = ModelSelector([det_model, sarima_model])
-    best_model = model_selector.select_best_model(forecast_features)
-    
-    # Visualizations
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        # Historical trend
-        fig_hist = px.line(df_logs, x='date', y='waste_tons', 
-                          title="Historical Waste Logs")
-        fig_hist.update_layout(xaxis_title="Date", yaxis_title="Waste (tons)")
-        st.plotly_chart(fig_hist, use_container_width=True)
-    
-    with col2:
-        # Cumulative waste
-        fig_cum = px.line(df_logs, x='date', y='cumulative_waste', 
-                         title="Cumulative Waste")
-        fig_cum.update_layout(xaxis_title="Date", yaxis_title="Cumulative Waste (tons)")
-        st.plotly_chart(fig_cum, use_container_width=True)
-    
-    # Forecast comparison
-    st.subheader("📊 Forecast Comparison")
-    
-    forecast_dates = pd.date_range(
-        start=df_logs['date'].max() + pd.Timedelta(days=1),
-        periods=forecast_days,
-        freq='D'
-    )
-    
-    forecast_df = pd.DataFrame({
-        'Date': forecast_dates,
-        'Deterministic': det_forecast,
-        'SARIMA': sarima_forecast
-    })
-    
+
+    # Daily forecast index via datetime64 arithmetic; cheaper than
+    # pd.date_range on every rebuild
+    last_log_date = np.datetime64(plot_logs['date'].max(), 'D')
+    forecast_dates = last_log_date + 1 + np.arange(forecast_days, dtype='timedelta64[D]')
+
     fig_forecast = go.Figure()
-    
-    # Add historical data
-    fig_forecast.add_trace(go.Scatter(
-        x=df_logs['date'], y=df_logs['waste_tons'],
+
+    fig_forecast.add_trace(go.Scattergl(
+        x=plot_logs['date'], y=plot_logs['waste_tons'],
         mode='lines+markers', name='Historical',
         line=dict(color='blue')
     ))
-    
-    # Add forecasts
-    fig_forecast.add_trace(go.Scatter(
-        x=forecast_df['Date'], y=forecast_df['Deterministic'],
+
+    fig_forecast.add_trace(go.Scattergl(
+        x=forecast_dates, y=det_forecast,
         mode='lines', name='Deterministic Forecast',
         line=dict(color='red', dash='dash')
     ))
-    
-    fig_forecast.add_trace(go.Scatter(
-        x=forecast_df['Date'], y=forecast_df['SARIMA'],
+
+    fig_forecast.add_trace(go.Scattergl(
+        x=forecast_dates, y=sarima_forecast,
         mode='lines', name='SARIMA Forecast',
         line=dict(color='green', dash='dot')
     ))
-    
+
     fig_forecast.update_layout(
         title="Waste Forecast (30 days)",
         xaxis_title="Date",
         yaxis_title="Waste (tons)"
     )
+
+    return fig_forecast
+
+def forecast_tab(params):
+    """Waste trend and forecast"""
+    st.header("📈 Waste Trend & Forecast")
     
-    st.plotly_chart(fig_forecast, use_container_width=True)
-    
+    df_logs = get_logs_df(st.session_state.username, st.session_state.logs_version)
+
+    if len(df_logs) < 2:
+        st.warning("Need at least 2 waste logs to generate forecasts")
+        return
+
+    # Cached figures; rebuilt only when the logs version changes
+    fig_hist, fig_cum = build_trend_figs(
+        st.session_state.username, st.session_state.logs_version
+    )
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.plotly_chart(fig_hist, use_container_width=True)
+
+    with col2:
+        st.plotly_chart(fig_cum, use_container_width=True)
+
+    # Forecast comparison
+    st.subheader("📊 Forecast Comparison")
+
+    st.plotly_chart(
+        build_forecast_fig(st.session_state.username,
+                           st.session_state.logs_version, 30),
+        use_container_width=True
+    )
+
+    _, _, forecast_features = fit_forecast_models(
+        st.session_state.username, st.session_state.logs_version
+    )
+
     # Model performance
     st.subheader("🎯 Model Performance")
     
     if len(forecast_features) >= 10:  # Need sufficient data for backtest
-        det_mape = backtest_model(det_model, forecast_features)
-        sarima_mape = backtest_model(sarima_model, forecast_features)
-        
+        det_mape, sarima_mape, best_name = backtest_forecast_models(
+            st.session_state.username, st.session_state.logs_version
+        )
+
         perf_df = pd.DataFrame({
             'Model': ['Deterministic', 'SARIMA'],
             'MAPE (%)': [det_mape, sarima_mape],
-            'Selected': ['✓' if best_model == det_model else '✗',
-                        '✓' if best_model == sarima_model else '✗']
+            'Selected': ['✓' if best_name == 'DeterministicModel' else '✗',
+                        '✓' if best_name == 'SARIMAModel' else '✗']
         })
-        
+
         st.dataframe(perf_df, use_container_width=True)
-        
-        st.info(f"**Best Model:** {type(best_model).__name__} (Lower MAPE is better)")
+
+        st.info(f"**Best Model:** {best_name} (Lower MAPE is better)")
     else:
         st.info("Need more data points for model backtesting")
 
 def energy_finance_tab(params):
     """Energy and finance calculations"""
+    import plotly.graph_objects as go
+
     st.header("⚡ Energy & Finance")
     
-    logs = get_user_logs(st.session_state.username)
-    
-    if not logs:
+    stats = compute_log_stats(st.session_state.username, st.session_state.logs_version)
+
+    if stats.tons.size == 0:
         st.warning("No waste logs found. Add some logs to see energy and finance projections.")
         return
-    
+
     # Calculate totals
-    total_waste = sum(log.waste_tons for log in logs)
-    today_waste = sum(log.waste_tons for log in logs if log.date == date.today())
-    
-    # Energy calculations
-    gross_electricity = total_waste * params['yield_rate'] * params['capacity_factor']
-    estimated_daily_electricity = today_waste * params['yield_rate'] * params['capacity_factor']
+    total_waste = stats.total
+    today_waste = stats.today
+
+    # Energy calculations (shared derived-metric block)
+    dm = derived_metrics(finance_params_tuple(params), stats.total, stats.today)
+    gross_electricity = dm.gross_kwh
+    estimated_daily_electricity = dm.today_kwh
     
     # Display metrics
     col1, col2, col3 = st.columns(3)
@@ -648,7 +974,7 @@ def energy_finance_tab(params):
         )
     
     with col3:
-        revenue_potential = gross_electricity * params['tariff']
+        revenue_potential = dm.revenue_potential
         st.metric(
             "Revenue Potential", 
             f"₹{format_number(revenue_potential)}",
@@ -658,93 +984,73 @@ def energy_finance_tab(params):
     # Financial projections
     st.subheader("💰 Financial Projections")
     
-    # Initialize finance calculator
-    calc = FinanceCalculator(
-        yield_rate=params['yield_rate'],
-        capacity_factor=params['capacity_factor'],
-        tariff=params['tariff'],
-        opex_per_ton=params['opex_per_ton'],
-        fixed_opex=params['fixed_opex'],
-        capex=params['capex'],
-        discount_rate=params['discount_rate'],
-        carbon_credit_price=params['carbon_credit_price'],
-        byproduct_price=params['byproduct_price'],
-        enable_byproduct=params['enable_byproduct']
-    )
-    
     # Calculate average daily waste for projections
-    if logs:
-        avg_daily_waste = total_waste / len(set(log.date for log in logs))
-    else:
-        avg_daily_waste = 1.0  # Default
-    
-    # Generate cashflows
-    cashflows = calc.calculate_cashflows(avg_daily_waste, params['horizon_years'])
-    
-    # Create cashflow chart
-    years = list(range(1, params['horizon_years'] + 1))
-    
+    avg_daily_waste = stats.avg_daily
+
+    # Columnar cashflows straight from the kernel; the chart and the
+    # export table share the same cached arrays without per-year dict
+    # indexing
+    (waste_arr, kwh_arr, elec_rev_arr, carbon_rev_arr, byprod_rev_arr,
+     revenue_arr, opex_arr, ncf_arr, _) = cached_cashflow_arrays(
+        finance_params_tuple(params), avg_daily_waste, params['horizon_years'])
+
+    years = np.arange(1, params['horizon_years'] + 1)
+
     fig_cf = go.Figure()
-    
-    # Split revenue into components for stacked bar chart
-    electricity_revenues = [cf['electricity_revenue'] for cf in cashflows]
-    carbon_revenues = [cf['carbon_revenue'] for cf in cashflows] 
-    byproduct_revenues = [cf['byproduct_revenue'] for cf in cashflows]
-    
+
     fig_cf.add_trace(go.Bar(
-        x=years, y=electricity_revenues,
+        x=years, y=elec_rev_arr,
         name='Electricity Revenue', marker_color='green'
     ))
-    
+
     fig_cf.add_trace(go.Bar(
-        x=years, y=carbon_revenues,
+        x=years, y=carbon_rev_arr,
         name='Carbon Credits', marker_color='lightgreen'
     ))
-    
+
     if params['enable_byproduct']:
         fig_cf.add_trace(go.Bar(
-            x=years, y=byproduct_revenues,
+            x=years, y=byprod_rev_arr,
             name=t('byproduct_revenue'), marker_color='darkgreen'
         ))
-    
+
     fig_cf.add_trace(go.Bar(
-        x=years, y=[-cf['opex'] for cf in cashflows],
+        x=years, y=-opex_arr,
         name='OPEX', marker_color='red'
     ))
-    
+
     fig_cf.add_trace(go.Scatter(
-        x=years, y=[cf['ncf'] for cf in cashflows],
+        x=years, y=ncf_arr,
         mode='lines+markers', name='Net Cash Flow',
         line=dict(color='blue', width=3)
     ))
-    
+
     fig_cf.update_layout(
         title="Annual Cashflows",
         xaxis_title="Year",
         yaxis_title="Amount (₹)",
         barmode='stack'
     )
-    
+
     st.plotly_chart(fig_cf, use_container_width=True)
-    
-    # Export cashflows
-    cf_df = pd.DataFrame([{
-        'Year': i+1,
-        'Waste (tons)': cf['waste_tons'],
-        'Electricity (kWh)': cf['electricity_kwh'],
-        'Electricity Revenue (₹)': cf['electricity_revenue'],
-        'Carbon Credits Revenue (₹)': cf['carbon_revenue'],
-        'Byproduct Revenue (₹)': cf['byproduct_revenue'],
-        'Total Revenue (₹)': cf['revenue'],
-        'OPEX (₹)': cf['opex'],
-        'Net Cash Flow (₹)': cf['ncf']
-    } for i, cf in enumerate(cashflows)])
+
+    cf_df = pd.DataFrame({
+        'Year': np.arange(1, params['horizon_years'] + 1),
+        'Waste (tons)': waste_arr,
+        'Electricity (kWh)': kwh_arr,
+        'Electricity Revenue (₹)': elec_rev_arr,
+        'Carbon Credits Revenue (₹)': carbon_rev_arr,
+        'Byproduct Revenue (₹)': byprod_rev_arr,
+        'Total Revenue (₹)': revenue_arr,
+        'OPEX (₹)': opex_arr,
+        'Net Cash Flow (₹)': ncf_arr
+    })
     
     st.subheader("📋 Annual Cashflow Table")
     st.dataframe(cf_df, use_container_width=True)
     
     # Download button
-    csv = cf_df.to_csv(index=False)
+    csv = df_to_csv_bytes(cf_df)
     st.download_button(
         label="Download Cashflows CSV",
         data=csv,
@@ -754,41 +1060,28 @@ def energy_finance_tab(params):
 
 def npv_sensitivity_tab(params):
     """NPV calculations and sensitivity analysis"""
+    import plotly.graph_objects as go
+
     st.header("💹 NPV & Sensitivity Analysis")
     
-    logs = get_user_logs(st.session_state.username)
-    
-    if not logs:
+    stats = compute_log_stats(st.session_state.username, st.session_state.logs_version)
+
+    if stats.tons.size == 0:
         st.warning("No waste logs found. Add some logs to see NPV analysis.")
         return
-    
+
     # Calculate average daily waste
-    total_waste = sum(log.waste_tons for log in logs)
-    avg_daily_waste = total_waste / len(set(log.date for log in logs))
+    total_waste = stats.total
+    avg_daily_waste = stats.avg_daily
     
-    # Initialize finance calculator
-    calc = FinanceCalculator(
-        yield_rate=params['yield_rate'],
-        capacity_factor=params['capacity_factor'],
-        tariff=params['tariff'],
-        opex_per_ton=params['opex_per_ton'],
-        fixed_opex=params['fixed_opex'],
-        capex=params['capex'],
-        discount_rate=params['discount_rate'],
-        carbon_credit_price=params['carbon_credit_price'],
-        byproduct_price=params['byproduct_price'],
-        enable_byproduct=params['enable_byproduct']
-    )
-    
-    # Calculate base case metrics
-    npv = calc.calculate_npv(avg_daily_waste, params['horizon_years'])
-    payback = calc.calculate_payback(avg_daily_waste, params['horizon_years'])
-    roi = calc.calculate_roi(avg_daily_waste, params['horizon_years'])
+    # Calculate base case metrics from the shared cached bundle
+    npv, payback, roi = npv_bundle(finance_params_tuple(params), avg_daily_waste,
+                                   params['horizon_years'])
     
-    # CO2 savings calculation
-    total_kwh = sum(log.waste_tons for log in logs) * params['yield_rate'] * params['capacity_factor']
-    co2_savings = (total_kwh * 0.9) / 1000  # kg to tons
-    trees_equivalent = 50 * co2_savings
+    # CO2 savings calculation (shared derived-metric block)
+    dm = derived_metrics(finance_params_tuple(params), stats.total, stats.today)
+    co2_savings = dm.co2_tons
+    trees_equivalent = dm.trees
     
     # Display metrics
     col1, col2, col3, col4 = st.columns(4)
@@ -818,94 +1111,13 @@ def npv_sensitivity_tab(params):
     # Sensitivity Analysis
     st.subheader("📊 Sensitivity Analysis")
     
-    # Parameters to analyze
-    sensitivity_params = {
-        'Yield Rate': ('yield_rate', params['yield_rate']),
-        'Tariff': ('tariff', params['tariff']),
-        'OPEX per ton': ('opex_per_ton', params['opex_per_ton']),
-        'CAPEX': ('capex', params['capex']),
-        'Discount Rate': ('discount_rate', params['discount_rate'])
-    }
-    
-    # Calculate sensitivity
-    sensitivity_results = []
-    
-    for param_name, (param_key, base_value) in sensitivity_params.items():
-        # +15% case
-        params_high = params.copy()
-        params_high[param_key] = base_value * 1.15
-        
-        calc_high = FinanceCalculator(
-            yield_rate=params_high['yield_rate'],
-            capacity_factor=params_high['capacity_factor'],
-            tariff=params_high['tariff'],
-            opex_per_ton=params_high['opex_per_ton'],
-            fixed_opex=params_high['fixed_opex'],
-            capex=params_high['capex'],
-            discount_rate=params_high['discount_rate'],
-            carbon_credit_price=params_high.get('carbon_credit_price', params['carbon_credit_price']),
-            byproduct_price=params_high.get('byproduct_price', params['byproduct_price']),
-            enable_byproduct=params_high.get('enable_byproduct', params['enable_byproduct'])
-        )
-        
-        npv_high = calc_high.calculate_npv(avg_daily_waste, params['horizon_years'])
-        
-        # -15% case
-        params_low = params.copy()
-        params_low[param_key] = base_value * 0.85
-        
-        calc_low = FinanceCalculator(
-            yield_rate=params_low['yield_rate'],
-            capacity_factor=params_low['capacity_factor'],
-            tariff=params_low['tariff'],
-            opex_per_ton=params_low['opex_per_ton'],
-            fixed_opex=params_low['fixed_opex'],
-            capex=params_low['capex'],
-            discount_rate=params_low['discount_rate'],
-            carbon_credit_price=params_low.get('carbon_credit_price', params['carbon_credit_price']),
-            byproduct_price=params_low.get('byproduct_price', params['byproduct_price']),
-            enable_byproduct=params_low.get('enable_byproduct', params['enable_byproduct'])
-        )
-        
-        npv_low = calc_low.calculate_npv(avg_daily_waste, params['horizon_years'])
-        
-        # Calculate sensitivity
-        npv_range = npv_high - npv_low
-        
-        sensitivity_results.append({
-            'Parameter': param_name,
-            'NPV Impact': npv_range,
-            'NPV Low (-15%)': npv_low,
-            'NPV High (+15%)': npv_high
-        })
-    
-    # Sort by impact
-    sensitivity_results.sort(key=lambda x: abs(x['NPV Impact']), reverse=True)
-    
-    # Create tornado chart
-    fig_tornado = go.Figure()
-    
-    params_list = [r['Parameter'] for r in sensitivity_results]
-    impacts = [r['NPV Impact'] for r in sensitivity_results]
-    
-    fig_tornado.add_trace(go.Bar(
-        y=params_list,
-        x=impacts,
-        orientation='h',
-        marker_color=['red' if x < 0 else 'green' for x in impacts]
-    ))
-    
-    fig_tornado.update_layout(
-        title="NPV Sensitivity Analysis (±15% parameter change)",
-        xaxis_title="NPV Impact (₹)",
-        yaxis_title="Parameter"
-    )
-    
+    fig_tornado, sens_df = build_tornado(
+        finance_params_tuple(params), avg_daily_waste, params['horizon_years'])
+
     st.plotly_chart(fig_tornado, use_container_width=True)
-    
+
     # Sensitivity table
     st.subheader("📋 Sensitivity Results")
-    sens_df = pd.DataFrame(sensitivity_results)
     st.dataframe(sens_df, use_container_width=True)
     
     # Optional Revenue Impact Comparison
@@ -913,21 +1125,12 @@ def npv_sensitivity_tab(params):
         st.subheader("🌱 Revenue Stream Comparison")
         
         # Calculate base scenario (no carbon credits, no byproduct)
-        calc_base = FinanceCalculator(
-            yield_rate=params['yield_rate'],
-            capacity_factor=params['capacity_factor'],
-            tariff=params['tariff'],
-            opex_per_ton=params['opex_per_ton'],
-            fixed_opex=params['fixed_opex'],
-            capex=params['capex'],
-            discount_rate=params['discount_rate'],
-            carbon_credit_price=0.0,
-            byproduct_price=0.0,
-            enable_byproduct=False
-        )
-        
-        npv_base = calc_base.calculate_npv(avg_daily_waste, params['horizon_years'])
-        npv_with_extras = calc.calculate_npv(avg_daily_waste, params['horizon_years'])
+        base_params = dict(params, carbon_credit_price=0.0,
+                           byproduct_price=0.0, enable_byproduct=False)
+
+        npv_base, _, _ = npv_bundle(finance_params_tuple(base_params), avg_daily_waste,
+                                    params['horizon_years'])
+        npv_with_extras = npv
         npv_improvement = npv_with_extras - npv_base
         
         col1, col2, col3 = st.columns(3)
@@ -939,21 +1142,21 @@ def npv_sensitivity_tab(params):
             st.metric("Improvement", f"₹{format_currency(npv_improvement)}", 
                      delta=f"{((npv_improvement/npv_base)*100):.1f}%" if npv_base != 0 else "N/A")
         
-        # Show revenue breakdown
-        cashflows = calc.calculate_cashflows(avg_daily_waste, params['horizon_years'])
-        total_electricity_rev = sum(cf['electricity_revenue'] for cf in cashflows)
-        total_carbon_rev = sum(cf['carbon_revenue'] for cf in cashflows)
-        total_byproduct_rev = sum(cf['byproduct_revenue'] for cf in cashflows)
-        
+        # Show revenue breakdown, summed over the columnar kernel arrays
+        (_, _, elec_rev_arr, carbon_rev_arr, byprod_rev_arr,
+         _, _, _, _) = cached_cashflow_arrays(finance_params_tuple(params),
+                                              avg_daily_waste,
+                                              params['horizon_years'])
+        stream_totals = np.array([elec_rev_arr.sum(), carbon_rev_arr.sum(),
+                                  byprod_rev_arr.sum()])
+        total_revenue = stream_totals.sum()
+
         st.write("**Revenue Breakdown over Project Life:**")
+        shares = stream_totals / total_revenue * 100
         revenue_breakdown = pd.DataFrame({
             'Revenue Stream': ['Electricity Sales', 'Carbon Credits', 'Byproduct Sales'],
-            'Total (₹)': [total_electricity_rev, total_carbon_rev, total_byproduct_rev],
-            'Percentage': [
-                f"{(total_electricity_rev/(total_electricity_rev + total_carbon_rev + total_byproduct_rev)*100):.1f}%",
-                f"{(total_carbon_rev/(total_electricity_rev + total_carbon_rev + total_byproduct_rev)*100):.1f}%",
-                f"{(total_byproduct_rev/(total_electricity_rev + total_carbon_rev + total_byproduct_rev)*100):.1f}%"
-            ]
+            'Total (₹)': stream_totals,
+            'Percentage': pd.Series(shares).map('{:.1f}%'.format)
         })
         st.dataframe(revenue_breakdown, use_container_width=True)
 
@@ -963,18 +1166,18 @@ def facilities_map_tab():
     
     # Load facilities data
     try:
-        facilities_data = load_curated_data()['facilities']
         user_city = st.session_state.user_profile.city
-        
-        # Filter facilities for user's city
-        city_facilities = facilities_data[facilities_data['city'] == user_city]
-        
+
+        # City filter and map construction are both cached
+        city_facilities = facilities_for_city(user_city)
+
         if len(city_facilities) > 0:
-            # Create map
-            facilities_map = create_facilities_map(city_facilities, user_city)
-            
-            # Display map
-            map_data = st_folium(facilities_map, width=700, height=500)
+            # Display the pre-rendered map HTML; nothing is read back
+            # from the map, so the static embed avoids both folium's
+            # per-rerun render and any interaction round trips
+            import streamlit.components.v1 as components
+            components.html(build_facilities_map_html(user_city),
+                            width=700, height=500)
             
             # Display facilities table
             st.subheader(f"🏭 Facilities in {user_city}")
@@ -1006,20 +1209,24 @@ def facilities_map_tab():
         st.error(f"Error loading facilities data: {str(e)}")
         st.info("Please check if the facilities data file is available and properly formatted.")
 
-def audit_tab(params):
-    """Audit trail with formulas and parameters"""
-    st.header("🔍 Audit Trail")
-    
+@st.fragment
+def _audit_static_section():
+    """Static audit content: formulas, provenance, and assumptions.
+
+    Rendered as a fragment so interactions inside it rerun only this
+    block; nothing here depends on the sidebar parameters.
+    """
+
     # LaTeX formulas
     st.subheader("📐 Mathematical Formulas")
-    
+
     st.markdown("### Energy Calculations")
     st.latex(r"kWh_{year,t} = tons_{year,t} \times yield \times capacity\_factor")
     st.latex(r"tons_{year,t} = tpd_t \times 365")
-    
+
     st.markdown("### Deterministic Forecast")
     st.latex(r"tpd_t = base\_tpd \times (1+g)^{(t-1)}")
-    
+
     st.markdown("### Financial Calculations")
     st.latex(r"electricity\_revenue_t = kWh_{year,t} \times tariff")
     st.latex(r"carbon\_revenue_t = \frac{kWh_{year,t} \times 0.9}{1000} \times carbon\_price")
@@ -1027,17 +1234,52 @@ def audit_tab(params):
     st.latex(r"total\_revenue_t = electricity\_revenue_t + carbon\_revenue_t + byproduct\_revenue_t")
     st.latex(r"opex_t = tons_{year,t} \times opex\_per\_ton + fixed\_opex")
     st.latex(r"ncf_t = total\_revenue_t - opex_t")
-    
+
     st.markdown("### NPV Calculation")
     st.latex(r"NPV = -CAPEX + \sum_{t=1}^{horizon} \frac{ncf_t}{(1+r)^t}")
-    
+
     st.markdown("### Environmental Impact")
     st.latex(r"CO_2\_savings = \frac{kWh \times 0.9}{1000} \text{ tons}")
     st.latex(r"Trees\_equivalent = 50 \times CO_2\_savings")
+
+    # Data provenance
+    st.subheader("📊 Data Provenance")
+
+    provenance_info = {
+        "User Data": "In-memory storage during session",
+        "Waste Logs": "User-entered data with auto-recorded timestamps",
+        "City Data": "Curated from government and industry sources",
+        "Facility Data": "Verified bioenergy facilities database",
+        "Tariff Data": "State electricity regulatory commission rates",
+        "Cost Parameters": "Industry benchmarks and user-adjustable"
+    }
+
+    for source, description in provenance_info.items():
+        st.write(f"**{source}:** {description}")
+
+    # Assumptions and limitations
+    st.subheader("⚠️ Assumptions & Limitations")
+
+    st.markdown("""
+    **Key Assumptions:**
+    - Constant yield rate and capacity factor over project lifetime
+    - Linear waste growth for deterministic forecasting
+    - Constant tariff rates (inflation not modeled)
+    - No major policy or regulatory changes
+    - Standard CO₂ emission factor (0.9 kg/kWh)
     
-    # Parameter table
-    st.subheader("⚙️ Current Parameters")
-    
+    **Limitations:**
+    - Supports only 8 cities in current version
+    - In-memory authentication (no data persistence)
+    - Simplified financial modeling (no tax considerations)
+    - SARIMA model assumes sufficient historical data
+    - No detailed technical feasibility assessment
+    """)
+
+@st.cache_data
+def audit_param_df(params) -> pd.DataFrame:
+    """Parameter table for the audit view, cached per parameter set"""
+
     param_data = {
         'Parameter': [
             'Yield Rate (kWh/ton)',
@@ -1079,87 +1321,78 @@ def audit_tab(params):
             'INR per ton'
         ]
     }
-    
-    param_df = pd.DataFrame(param_data)
-    st.dataframe(param_df, use_container_width=True)
-    
-    # Data provenance
-    st.subheader("📊 Data Provenance")
-    
-    provenance_info = {
-        "User Data": "In-memory storage during session",
-        "Waste Logs": "User-entered data with auto-recorded timestamps",
-        "City Data": "Curated from government and industry sources",
-        "Facility Data": "Verified bioenergy facilities database",
-        "Tariff Data": "State electricity regulatory commission rates",
-        "Cost Parameters": "Industry benchmarks and user-adjustable"
-    }
-    
-    for source, description in provenance_info.items():
-        st.write(f"**{source}:** {description}")
-    
-    # Configuration export
-    st.subheader("💾 Export Configuration")
-    
-    # Create run configuration
-    run_config = {
-        "timestamp": datetime.now().isoformat(),
-        "user": st.session_state.username,
-        "entity": st.session_state.user_profile.entity_name,
-        "city": st.session_state.user_profile.city,
-        "waste_type": st.session_state.user_profile.waste_type,
+
+    return pd.DataFrame(param_data)
+
+@st.cache_data
+def audit_config_payload(params, username: str, entity_name: str, city: str,
+                         waste_type: str, total_logs: int) -> dict:
+    """Run-configuration payload, cached per (parameters, user, logs)
+    state; the export timestamp is stamped on at download time"""
+
+    return {
+        "user": username,
+        "entity": entity_name,
+        "city": city,
+        "waste_type": waste_type,
         "parameters": params,
-        "total_logs": len(get_user_logs(st.session_state.username)),
+        "total_logs": total_logs,
         "application_version": "BIA v1.0"
     }
-    
-    config_json = json.dumps(run_config, indent=2, default=str)
-    
+
+def audit_tab(params):
+    """Audit trail with formulas and parameters"""
+    st.header("🔍 Audit Trail")
+
+    # Static content lives in a fragment; only the sections below depend
+    # on the sidebar parameters
+    _audit_static_section()
+
+    # Parameter table
+    st.subheader("⚙️ Current Parameters")
+
+    param_df = audit_param_df(params)
+    st.dataframe(param_df, use_container_width=True)
+
+    # Configuration export
+    st.subheader("💾 Export Configuration")
+
+    profile = st.session_state.user_profile
+    payload = audit_config_payload(
+        params, st.session_state.username, profile.entity_name,
+        profile.city, profile.waste_type,
+        len(get_logs_df(st.session_state.username, st.session_state.logs_version))
+    )
+
+    # One fresh timestamp shared by the file's contents and its name
+    now = datetime.now()
+    config_json = json.dumps({"timestamp": now.isoformat(), **payload},
+                             indent=2, default=str)
+
     st.download_button(
         label="Download Run Configuration",
         data=config_json,
-        file_name=f"bia_config_{st.session_state.username}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+        file_name=f"bia_config_{st.session_state.username}_{now.strftime('%Y%m%d_%H%M%S')}.json",
         mime="application/json"
     )
-    
-    # Assumptions and limitations
-    st.subheader("⚠️ Assumptions & Limitations")
-    
-    st.markdown("""
-    **Key Assumptions:**
-    - Constant yield rate and capacity factor over project lifetime
-    - Linear waste growth for deterministic forecasting
-    - Constant tariff rates (inflation not modeled)
-    - No major policy or regulatory changes
-    - Standard CO₂ emission factor (0.9 kg/kWh)
-    
-    **Limitations:**
-    - Supports only 8 cities in current version
-    - In-memory authentication (no data persistence)
-    - Simplified financial modeling (no tax considerations)
-    - SARIMA model assumes sufficient historical data
-    - No detailed technical feasibility assessment
-    """)
 
 def get_kpi_data(params):
     """Calculate KPI data for dashboard"""
-    logs = get_user_logs(st.session_state.username)
-    
-    if not logs:
+    stats = compute_log_stats(st.session_state.username, st.session_state.logs_version)
+
+    if stats.tons.size == 0:
         return {
             'total_waste': 0,
             'total_energy': 0,
             'co2_saved': 0
         }
-    
-    total_waste = sum(log.waste_tons for log in logs)
-    total_energy = total_waste * params['yield_rate'] * params['capacity_factor']
-    co2_saved = (total_energy * 0.9) / 1000  # kg to tons
-    
+
+    dm = derived_metrics(finance_params_tuple(params), stats.total, stats.today)
+
     return {
-        'total_waste': total_waste,
-        'total_energy': total_energy,
-        'co2_saved': co2_saved
+        'total_waste': stats.total,
+        'total_energy': dm.gross_kwh,
+        'co2_saved': dm.co2_tons
     }
 
 def clean_dashboard_screen(params):
@@ -1234,6 +1467,7 @@ def clean_dashboard_screen(params):
                     waste_tons=waste_amount
                 )
                 add_waste_log(waste_log)
+                st.session_state.logs_version += 1
                 st.success(f"Added {waste_amount} {t('tons')} of waste for {log_date}")
                 st.rerun()
             else:
@@ -1248,33 +1482,38 @@ def main_dashboard():
     clean_dashboard_screen(params)
     
     st.divider()
-    
-    # Create tabs for detailed analysis
-    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
+
+    # st.tabs executes every tab body on every rerun; a radio selector runs
+    # only the view the user is actually looking at
+    view_labels = [
         f"🏢 {t('entity_profile')}",
-        f"📈 {t('waste_trend_forecast')}", 
+        f"📈 {t('waste_trend_forecast')}",
         f"⚡ {t('energy_finance')}",
         f"💹 {t('npv_sensitivity')}",
         f"🗺️ {t('facilities_map')}",
         f"🔍 {t('audit')}"
-    ])
-    
-    with tab1:
+    ]
+
+    view = st.radio(
+        "View",
+        options=range(len(view_labels)),
+        format_func=lambda i: view_labels[i],
+        horizontal=True,
+        label_visibility="collapsed",
+        key="active_view"
+    )
+
+    if view == 0:
         entity_profile_tab()
-    
-    with tab2:
+    elif view == 1:
         forecast_tab(params)
-    
-    with tab3:
+    elif view == 2:
         energy_finance_tab(params)
-    
-    with tab4:
+    elif view == 3:
         npv_sensitivity_tab(params)
-    
-    with tab5:
+    elif view == 4:
         facilities_map_tab()
-    
-    with tab6:
+    else:
         audit_tab(params)
 
 def main():
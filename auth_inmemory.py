@@ -4,42 +4,52 @@ Uses bcrypt for password hashing and Streamlit cache for thread-safe storage.
 """
 
 import bcrypt
+import numpy as np
 import streamlit as st
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime, date
 from bia_core.schemas import UserProfile, WasteLog
 
 @st.cache_resource
 def get_auth_store():
-    """Get thread-safe authentication store"""
-    return {
+    """Get thread-safe authentication store, seeded with the demo user"""
+    store = {
         'users': {},
-        'waste_logs': []
+        'waste_logs': {},   # username -> list of WasteLog
+        'log_arrays': {},   # username -> growable (dates, tons) SoA buffers
+        'user_totals': {}   # username -> running total waste in tons
     }
+    _seed_demo_user(store)
+    return store
+
+def _seed_demo_user(store):
+    """Create the demo account once per process.
+
+    The demo password is public, so a reduced bcrypt cost is fine here
+    and keeps store construction from blocking the first render; real
+    signups in add_user stay at the library default cost.
+    """
+    password_hash = bcrypt.hashpw('demo123'.encode('utf-8'),
+                                  bcrypt.gensalt(rounds=10))
+
+    store['users']['demo'] = UserProfile(
+        username='demo',
+        password_hash=password_hash.decode('utf-8'),
+        entity_name='Demo Bio-energy Corp',
+        city='Mumbai',
+        waste_type='organic'
+    )
+
+# Starting capacity for the per-user log buffers; doubled when full
+_INITIAL_CAPACITY = 16
 
 class AuthStore:
     """Thread-safe authentication and data store"""
     
     def __init__(self):
         self.store = get_auth_store()
-        self._init_demo_user()
-    
-    def _init_demo_user(self):
-        """Initialize demo user if not exists"""
-        if 'demo' not in self.store['users']:
-            # Hash the demo password
-            password_hash = bcrypt.hashpw('demo123'.encode('utf-8'), bcrypt.gensalt())
-            
-            demo_profile = UserProfile(
-                username='demo',
-                password_hash=password_hash.decode('utf-8'),
-                entity_name='Demo Bio-energy Corp',
-                city='Mumbai',
-                waste_type='organic'
-            )
-            
-            self.store['users']['demo'] = demo_profile
-    
+
+
     def add_user(self, username: str, password: str, entity_name: str, 
                  city: str, waste_type: str) -> bool:
         """Add new user with hashed password"""
@@ -74,12 +84,74 @@ class AuthStore:
         return None
     
     def add_waste_log(self, waste_log: WasteLog):
-        """Add waste log entry"""
-        self.store['waste_logs'].append(waste_log)
-    
+        """Add waste log entry, appending to the SoA buffers in place"""
+        self.store['waste_logs'].setdefault(waste_log.username, []).append(waste_log)
+
+        # Running total maintained incrementally, O(1) per insert
+        totals = self.store['user_totals']
+        totals[waste_log.username] = (totals.get(waste_log.username, 0.0)
+                                      + waste_log.waste_tons)
+
+        buffers = self.store['log_arrays'].get(waste_log.username)
+        if buffers is not None:
+            self._append_to_buffers(buffers, waste_log)
+
+    @staticmethod
+    def _append_to_buffers(buffers: Dict[str, Any], waste_log: WasteLog):
+        """Append one log to the preallocated arrays, doubling when full"""
+        size = buffers['size']
+
+        if size == buffers['tons'].size:
+            for key in ('dates', 'tons'):
+                grown = np.empty(2 * size, dtype=buffers[key].dtype)
+                grown[:size] = buffers[key]
+                buffers[key] = grown
+
+        buffers['dates'][size] = np.datetime64(waste_log.date, 'D')
+        buffers['tons'][size] = waste_log.waste_tons
+        buffers['size'] = size + 1
+
+    def _log_buffers(self, username: str) -> Dict[str, Any]:
+        """Get (or lazily build) the user's SoA log buffers"""
+        buffers = self.store['log_arrays'].get(username)
+
+        if buffers is None:
+            logs = self.store['waste_logs'].get(username, [])
+            capacity = max(_INITIAL_CAPACITY, 2 * len(logs))
+
+            dates = np.empty(capacity, dtype='datetime64[D]')
+            tons = np.empty(capacity, dtype=np.float64)
+            dates[:len(logs)] = np.array([log.date for log in logs],
+                                         dtype='datetime64[D]')
+            tons[:len(logs)] = np.fromiter((log.waste_tons for log in logs),
+                                           dtype=np.float64, count=len(logs))
+
+            buffers = {'dates': dates, 'tons': tons, 'size': len(logs)}
+            self.store['log_arrays'][username] = buffers
+
+        return buffers
+
     def get_user_logs(self, username: str) -> List[WasteLog]:
         """Get all waste logs for a user"""
-        return [log for log in self.store['waste_logs'] if log.username == username]
+        return self.store['waste_logs'].get(username, [])
+
+    def get_user_logs_array(self, username: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Get (dates, tons) array views over the user's log buffers"""
+        buffers = self._log_buffers(username)
+        size = buffers['size']
+        return buffers['dates'][:size], buffers['tons'][:size]
+
+    def get_user_total(self, username: str) -> float:
+        """Get the user's total logged waste from the running tally"""
+        total = self.store['user_totals'].get(username)
+
+        if total is None:
+            # Backfill once for users logged before the tally existed
+            _, tons = self.get_user_logs_array(username)
+            total = float(tons.sum())
+            self.store['user_totals'][username] = total
+
+        return total
 
 # Global auth store instance
 auth_store = AuthStore()
@@ -100,3 +172,11 @@ def add_waste_log(waste_log: WasteLog):
 def get_user_logs(username: str) -> List[WasteLog]:
     """Get user's waste logs"""
     return auth_store.get_user_logs(username)
+
+def get_user_logs_array(username: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Get user's waste logs as (dates, tons) NumPy arrays"""
+    return auth_store.get_user_logs_array(username)
+
+def get_user_total(username: str) -> float:
+    """Get user's total logged waste in tons"""
+    return auth_store.get_user_total(username)
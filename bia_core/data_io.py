@@ -8,12 +8,37 @@ import os
 from typing import Dict, Any
 import streamlit as st
 
+# Explicit dtypes skip per-column inference on load; low-cardinality
+# string columns come in as categoricals
+CURATED_DTYPES = {
+    'city_stats': {
+        'city': 'category', 'population': 'float64',
+        'waste_generation_tpd': 'float64', 'organic_fraction': 'float64',
+        'industrial_fraction': 'float64', 'agricultural_fraction': 'float64'
+    },
+    'facilities': {
+        'name': 'string', 'city': 'category', 'state': 'category',
+        'type': 'category', 'capacity_mw': 'float64', 'status': 'category',
+        'lat': 'float64', 'lon': 'float64', 'source': 'string'
+    },
+    'tariffs': {
+        'city': 'category', 'state': 'category',
+        'tariff_residential': 'float64', 'tariff_commercial': 'float64',
+        'tariff_industrial': 'float64', 'renewable_tariff': 'float64'
+    },
+    'costs': {
+        'technology': 'category', 'capex_per_mw': 'float64',
+        'opex_per_mwh': 'float64', 'capacity_factor': 'float64',
+        'lifetime_years': 'float64'
+    }
+}
+
 @st.cache_data
 def load_curated_data() -> Dict[str, pd.DataFrame]:
     """Load all curated data files"""
-    
+
     data = {}
-    
+
     # Define data files
     data_files = {
         'city_stats': 'data/curated/city_stats.csv',
@@ -21,18 +46,18 @@ def load_curated_data() -> Dict[str, pd.DataFrame]:
         'tariffs': 'data/curated/tariffs.csv',
         'costs': 'data/curated/costs.csv'
     }
-    
+
     for key, filepath in data_files.items():
         try:
             if os.path.exists(filepath):
-                data[key] = pd.read_csv(filepath)
+                data[key] = pd.read_csv(filepath, dtype=CURATED_DTYPES.get(key))
             else:
                 # Create empty dataframe with expected structure
                 data[key] = create_empty_dataframe(key)
         except Exception as e:
             st.warning(f"Could not load {filepath}: {str(e)}")
             data[key] = create_empty_dataframe(key)
-    
+
     return data
 
 def create_empty_dataframe(data_type: str) -> pd.DataFrame:
@@ -65,11 +90,25 @@ def create_empty_dataframe(data_type: str) -> pd.DataFrame:
     else:
         return pd.DataFrame()
 
+@st.cache_data
+def _indexed_by_city(key: str) -> pd.DataFrame:
+    """Curated table indexed by city, cached for O(1) lookups"""
+    df = load_curated_data()[key]
+    if df.empty or 'city' not in df.columns:
+        return df
+    return df.set_index('city').sort_index()
+
+@st.cache_data
+def _facility_counts() -> pd.Series:
+    """Facility count per city, computed once"""
+    facilities = load_curated_data()['facilities']
+    if facilities.empty:
+        return pd.Series(dtype='int64')
+    return facilities['city'].value_counts()
+
 def get_city_data(city: str) -> Dict[str, Any]:
     """Get data specific to a city"""
-    
-    curated_data = load_curated_data()
-    
+
     city_info = {
         'city': city,
         'population': None,
@@ -77,27 +116,20 @@ def get_city_data(city: str) -> Dict[str, Any]:
         'tariff': 4.5,  # Default tariff
         'facilities_count': 0
     }
-    
-    # Get city statistics
-    city_stats = curated_data['city_stats']
-    if not city_stats.empty:
-        city_row = city_stats[city_stats['city'] == city]
-        if not city_row.empty:
-            city_info.update(city_row.iloc[0].to_dict())
-    
+
+    # Get city statistics via the indexed lookup instead of a column scan
+    city_stats = _indexed_by_city('city_stats')
+    if not city_stats.empty and city in city_stats.index:
+        city_info.update(city_stats.loc[city].to_dict())
+
     # Get tariff information
-    tariffs = curated_data['tariffs']
-    if not tariffs.empty:
-        tariff_row = tariffs[tariffs['city'] == city]
-        if not tariff_row.empty:
-            city_info['tariff'] = tariff_row.iloc[0].get('renewable_tariff', 4.5)
-    
-    # Count facilities
-    facilities = curated_data['facilities']
-    if not facilities.empty:
-        city_facilities = facilities[facilities['city'] == city]
-        city_info['facilities_count'] = len(city_facilities)
-    
+    tariffs = _indexed_by_city('tariffs')
+    if not tariffs.empty and city in tariffs.index:
+        city_info['tariff'] = tariffs.loc[city].get('renewable_tariff', 4.5)
+
+    # Count facilities from the precomputed per-city tally
+    city_info['facilities_count'] = int(_facility_counts().get(city, 0))
+
     return city_info
 
 def export_user_data(username: str, data: Dict[str, Any]) -> str:
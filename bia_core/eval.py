@@ -5,10 +5,13 @@ Includes backtesting and performance metrics.
 
 import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from numpy.typing import ArrayLike
 from typing import List, Dict, Any, Tuple
+from scipy import stats as scipy_stats
 from bia_core.models import BaseModel
 
-def calculate_mape(actual: List[float], predicted: List[float]) -> float:
+def calculate_mape(actual: ArrayLike, predicted: ArrayLike) -> float:
     """Calculate Mean Absolute Percentage Error"""
     
     if len(actual) != len(predicted):
@@ -16,62 +19,61 @@ def calculate_mape(actual: List[float], predicted: List[float]) -> float:
     
     if len(actual) == 0:
         return float('inf')
-    
+
+    actual_array = np.asarray(actual, dtype=np.float64)
+    predicted_array = np.asarray(predicted, dtype=np.float64)
+
     # Handle zeros in actual values
-    actual_array = np.array(actual)
-    predicted_array = np.array(predicted)
-    
-    # Only consider non-zero actual values
-    non_zero_mask = actual_array != 0
-    
-    if not non_zero_mask.any():
+    non_zero = np.count_nonzero(actual_array)
+    if non_zero == 0:
         # If all actual values are zero, use MAE instead
-        return calculate_mae(actual, predicted)
-    
-    # Calculate MAPE only for non-zero values
-    actual_nz = actual_array[non_zero_mask]
-    predicted_nz = predicted_array[non_zero_mask]
-    
-    mape = np.mean(np.abs((actual_nz - predicted_nz) / actual_nz)) * 100
-    
-    return mape
+        return calculate_mae(actual_array, predicted_array)
+
+    # Masked division writes relative errors in place, skipping the
+    # fancy-indexed copies a boolean mask would allocate
+    rel_error = np.zeros_like(actual_array)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.divide(actual_array - predicted_array, actual_array,
+                  out=rel_error, where=actual_array != 0)
+
+    return float(np.abs(rel_error, out=rel_error).sum() / non_zero * 100)
 
-def calculate_mae(actual: List[float], predicted: List[float]) -> float:
+def calculate_mae(actual: ArrayLike, predicted: ArrayLike) -> float:
     """Calculate Mean Absolute Error"""
     
     if len(actual) != len(predicted):
         raise ValueError("Actual and predicted arrays must have same length")
     
-    actual_array = np.array(actual)
-    predicted_array = np.array(predicted)
-    
+    actual_array = np.asarray(actual, dtype=np.float64)
+    predicted_array = np.asarray(predicted, dtype=np.float64)
+
     mae = np.mean(np.abs(actual_array - predicted_array))
     
     return mae
 
-def calculate_rmse(actual: List[float], predicted: List[float]) -> float:
+def calculate_rmse(actual: ArrayLike, predicted: ArrayLike) -> float:
     """Calculate Root Mean Square Error"""
     
     if len(actual) != len(predicted):
         raise ValueError("Actual and predicted arrays must have same length")
     
-    actual_array = np.array(actual)
-    predicted_array = np.array(predicted)
-    
+    actual_array = np.asarray(actual, dtype=np.float64)
+    predicted_array = np.asarray(predicted, dtype=np.float64)
+
     mse = np.mean((actual_array - predicted_array) ** 2)
     rmse = np.sqrt(mse)
     
     return rmse
 
-def calculate_r2(actual: List[float], predicted: List[float]) -> float:
+def calculate_r2(actual: ArrayLike, predicted: ArrayLike) -> float:
     """Calculate R-squared coefficient"""
     
     if len(actual) != len(predicted):
         raise ValueError("Actual and predicted arrays must have same length")
     
-    actual_array = np.array(actual)
-    predicted_array = np.array(predicted)
-    
+    actual_array = np.asarray(actual, dtype=np.float64)
+    predicted_array = np.asarray(predicted, dtype=np.float64)
+
     # Calculate R-squared
     ss_res = np.sum((actual_array - predicted_array) ** 2)
     ss_tot = np.sum((actual_array - np.mean(actual_array)) ** 2)
@@ -80,9 +82,52 @@ def calculate_r2(actual: List[float], predicted: List[float]) -> float:
         return 0.0  # Perfect fit if no variance in actual
     
     r2 = 1 - (ss_res / ss_tot)
-    
+
     return r2
 
+def compute_all_metrics(actual: ArrayLike, predicted: ArrayLike) -> Dict[str, float]:
+    """
+    Calculate MAPE, MAE, RMSE and R² in one fused pass
+
+    Converts the inputs once and shares the difference array between all
+    four metrics, instead of each metric re-converting and re-allocating
+    its own temporaries.
+
+    Returns:
+        Dictionary with 'mape', 'mae', 'rmse' and 'r2' keys
+    """
+
+    if len(actual) != len(predicted):
+        raise ValueError("Actual and predicted arrays must have same length")
+
+    if len(actual) == 0:
+        return {'mape': float('inf'), 'mae': float('inf'),
+                'rmse': float('inf'), 'r2': 0.0}
+
+    actual_array = np.asarray(actual, dtype=np.float64)
+    predicted_array = np.asarray(predicted, dtype=np.float64)
+
+    diff = actual_array - predicted_array
+    abs_diff = np.abs(diff)
+    sq_diff = diff * diff
+
+    mae = float(abs_diff.mean())
+    ss_res = float(np.add.reduce(sq_diff))
+    rmse = float(np.sqrt(ss_res / len(actual_array)))
+
+    non_zero_mask = actual_array != 0
+    if non_zero_mask.any():
+        mape = float(np.mean(abs_diff[non_zero_mask]
+                             / np.abs(actual_array[non_zero_mask])) * 100)
+    else:
+        # If all actual values are zero, fall back to MAE
+        mape = mae
+
+    ss_tot = float(np.add.reduce((actual_array - actual_array.mean()) ** 2))
+    r2 = 1 - (ss_res / ss_tot) if ss_tot != 0 else 0.0
+
+    return {'mape': mape, 'mae': mae, 'rmse': rmse, 'r2': r2}
+
 def backtest_model(model: BaseModel, features_df: pd.DataFrame, 
                    test_size: int = 7, min_train_size: int = 7) -> float:
     """
@@ -101,42 +146,54 @@ def backtest_model(model: BaseModel, features_df: pd.DataFrame,
     if len(features_df) < min_train_size + test_size:
         return float('inf')
     
-    all_actuals = []
-    all_predictions = []
-    
+    actuals_all = features_df['waste_tons'].to_numpy(dtype=np.float64)
+
+    actual_folds = []
+    prediction_folds = []
+
     # Sliding window backtesting
     max_train_end = len(features_df) - test_size
-    
-    for train_end in range(min_train_size, max_train_end + 1, test_size):
-        # Split data
-        train_data = features_df.iloc[:train_end].copy()
-        test_data = features_df.iloc[train_end:train_end + test_size].copy()
-        
-        if len(test_data) == 0:
-            continue
-        
-        try:
-            # Fit model on training data
-            model.fit(train_data)
-            
-            # Generate forecast
-            forecast = model.predict(len(test_data))
-            
-            # Collect results
-            actual_values = test_data['waste_tons'].tolist()
-            all_actuals.extend(actual_values)
-            all_predictions.extend(forecast[:len(actual_values)])
-            
-        except Exception as e:
-            print(f"Backtest iteration failed: {e}")
-            continue
-    
-    if len(all_actuals) == 0:
+
+    # Window fits are one-offs (every window has a distinct data
+    # digest), so suspend on-disk fit persistence for the duration
+    persist_prev = getattr(model, 'persist_fits', None)
+    if persist_prev is not None:
+        model.persist_fits = False
+
+    try:
+        for train_end in range(min_train_size, max_train_end + 1, test_size):
+            # Split data; a view is enough since fit treats input as read-only
+            train_data = features_df.iloc[:train_end]
+            test_actuals = actuals_all[train_end:train_end + test_size]
+
+            if len(test_actuals) == 0:
+                continue
+
+            try:
+                # Fit model on training data
+                model.fit(train_data)
+
+                # Generate forecast
+                forecast = np.asarray(model.predict(len(test_actuals)), dtype=np.float64)
+
+                # Collect per-fold arrays; concatenated once below
+                actual_folds.append(test_actuals)
+                prediction_folds.append(forecast[:len(test_actuals)])
+
+            except Exception as e:
+                print(f"Backtest iteration failed: {e}")
+                continue
+    finally:
+        if persist_prev is not None:
+            model.persist_fits = persist_prev
+
+    if not actual_folds:
         return float('inf')
-    
-    # Calculate MAPE
-    mape = calculate_mape(all_actuals, all_predictions)
-    
+
+    # Calculate MAPE in one vectorized pass over the concatenated folds
+    mape = calculate_mape(np.concatenate(actual_folds),
+                          np.concatenate(prediction_folds))
+
     return mape
 
 def evaluate_model_performance(model: BaseModel, features_df: pd.DataFrame,
@@ -182,22 +239,14 @@ def evaluate_model_performance(model: BaseModel, features_df: pd.DataFrame,
         
         # Generate predictions
         forecast = model.predict(len(test_data))
-        actual = test_data['waste_tons'].tolist()
-        
-        # Calculate metrics
-        mape = calculate_mape(actual, forecast)
-        mae = calculate_mae(actual, forecast)
-        rmse = calculate_rmse(actual, forecast)
-        r2 = calculate_r2(actual, forecast)
-        
-        return {
-            'mape': mape,
-            'mae': mae,
-            'rmse': rmse,
-            'r2': r2,
-            'data_points': len(features_df),
-            'test_points': len(test_data)
-        }
+        actual = test_data['waste_tons'].to_numpy(dtype=np.float64)
+
+        # All four metrics from one fused pass over the arrays
+        metrics = compute_all_metrics(actual, forecast)
+        metrics['data_points'] = len(features_df)
+        metrics['test_points'] = len(test_data)
+
+        return metrics
         
     except Exception as e:
         print(f"Model evaluation failed: {e}")
@@ -210,32 +259,38 @@ def evaluate_model_performance(model: BaseModel, features_df: pd.DataFrame,
         }
 
 def compare_models(models: List[BaseModel], features_df: pd.DataFrame) -> pd.DataFrame:
-    """Compare performance of multiple models"""
-    
-    results = []
-    
-    for model in models:
+    """Compare performance of multiple models.
+
+    Candidates share no state, so evaluations run in a small thread
+    pool; statsmodels releases the GIL in its numeric routines, and the
+    models keep their own fitted state.
+    """
+
+    def evaluate_one(model: BaseModel) -> Dict[str, Any]:
         model_name = type(model).__name__
-        
+
         try:
-            # Evaluate model
             performance = evaluate_model_performance(model, features_df)
-            
-            # Add model info
             performance['model'] = model_name
-            results.append(performance)
-            
+            return performance
+
         except Exception as e:
             print(f"Failed to evaluate {model_name}: {e}")
-            results.append({
+            return {
                 'model': model_name,
                 'mape': float('inf'),
                 'mae': float('inf'),
                 'rmse': float('inf'),
                 'r2': 0.0,
                 'data_points': len(features_df)
-            })
-    
+            }
+
+    if len(models) > 1:
+        with ThreadPoolExecutor(max_workers=min(len(models), 4)) as pool:
+            results = list(pool.map(evaluate_one, models))
+    else:
+        results = [evaluate_one(model) for model in models]
+
     # Create comparison dataframe
     comparison_df = pd.DataFrame(results)
     
@@ -267,32 +322,22 @@ def forecast_confidence_interval(model: BaseModel, features_df: pd.DataFrame,
     
     # Calculate residuals for confidence interval estimation
     if len(features_df) >= 10:
-        # Use recent data for residual calculation
-        recent_data = features_df.tail(min(30, len(features_df)))
-        
-        # Simple residual-based confidence intervals
-        predictions_for_residuals = []
-        actuals_for_residuals = recent_data['waste_tons'].tolist()
-        
-        # Generate predictions for recent period
-        for i in range(len(recent_data)):
-            temp_train = recent_data.iloc[:max(1, i)].copy()
-            if len(temp_train) > 0:
-                temp_model = type(model)()
-                temp_model.fit(temp_train)
-                pred = temp_model.predict(1)
-                predictions_for_residuals.append(pred[0] if pred else 0)
-            else:
-                predictions_for_residuals.append(0)
-        
+        # Hold out the recent tail and score it with one fit, instead of
+        # refitting a fresh model per point (O(N^2) in fit cost)
+        holdout = min(30, len(features_df) // 2)
+        train_data = features_df.iloc[:-holdout]
+        actuals = features_df['waste_tons'].to_numpy(dtype=np.float64)[-holdout:]
+
+        holdout_model = type(model)()
+        holdout_model.fit(train_data)
+        predictions = np.asarray(holdout_model.predict(holdout), dtype=np.float64)
+
         # Calculate residual standard deviation
-        residuals = np.array(actuals_for_residuals) - np.array(predictions_for_residuals)
-        residual_std = np.std(residuals)
-        
+        residual_std = np.std(actuals - predictions)
+
         # Z-score for confidence level
-        from scipy import stats
-        z_score = stats.norm.ppf((1 + confidence_level) / 2)
-        
+        z_score = scipy_stats.norm.ppf((1 + confidence_level) / 2)
+
         # Calculate bounds
         margin = z_score * residual_std
         lower_bound = [max(0, f - margin) for f in forecast]
@@ -323,27 +368,33 @@ def residual_analysis(model: BaseModel, features_df: pd.DataFrame) -> Dict[str,
         
         # Generate predictions
         predictions = model.predict(len(test_data))
-        actuals = test_data['waste_tons'].tolist()
-        
+        actuals = test_data['waste_tons'].to_numpy(dtype=np.float64)
+
         # Calculate residuals
-        residuals = np.array(actuals) - np.array(predictions)
-        
-        # Residual statistics
+        residuals = actuals - np.asarray(predictions, dtype=np.float64)
+
+        # Shared moments: mean/std computed once, z-scores reused by
+        # both skewness and kurtosis instead of six passes over the array
+        mean = float(residuals.mean())
+        std = float(residuals.std())
+        z = (residuals - mean) / std if std > 0 else np.zeros_like(residuals)
+        z2 = z * z
+
         residual_stats = {
-            'mean': np.mean(residuals),
-            'std': np.std(residuals),
-            'min': np.min(residuals),
-            'max': np.max(residuals),
-            'median': np.median(residuals),
-            'skewness': float(np.mean(((residuals - np.mean(residuals)) / np.std(residuals)) ** 3)),
-            'kurtosis': float(np.mean(((residuals - np.mean(residuals)) / np.std(residuals)) ** 4))
+            'mean': mean,
+            'std': std,
+            'min': float(residuals.min()),
+            'max': float(residuals.max()),
+            'median': float(np.median(residuals)),
+            'skewness': float((z2 * z).mean()),
+            'kurtosis': float((z2 * z2).mean())
         }
-        
+
         return {
             'residual_stats': residual_stats,
             'residuals': residuals.tolist(),
             'predictions': predictions,
-            'actuals': actuals
+            'actuals': actuals.tolist()
         }
         
     except Exception as e:
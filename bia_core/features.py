@@ -18,23 +18,22 @@ def create_forecast_features(df_logs: pd.DataFrame) -> pd.DataFrame:
     if 'date' in df.columns:
         df['date'] = pd.to_datetime(df['date'])
     
-    # Sort by date
-    df = df.sort_values('date').reset_index(drop=True)
-    
-    # Aggregate by date (in case multiple logs per day)
+    # Aggregate by date (in case multiple logs per day); groupby sorts
+    # the keys, so no separate sort pass is needed
     daily_data = df.groupby('date')['waste_tons'].sum().reset_index()
     
-    # Fill missing dates
+    # Fill missing dates with one reindex pass instead of merge + fillna
     if len(daily_data) > 1:
         date_range = pd.date_range(
-            start=daily_data['date'].min(),
-            end=daily_data['date'].max(),
+            start=daily_data['date'].iloc[0],
+            end=daily_data['date'].iloc[-1],
             freq='D'
         )
-        
-        full_df = pd.DataFrame({'date': date_range})
-        daily_data = full_df.merge(daily_data, on='date', how='left')
-        daily_data['waste_tons'] = daily_data['waste_tons'].fillna(0)
+
+        daily_data = (daily_data.set_index('date')
+                      .reindex(date_range, fill_value=0.0)
+                      .rename_axis('date')
+                      .reset_index())
     
     # Create time-based features
     daily_data['day_of_week'] = daily_data['date'].dt.dayofweek
@@ -42,17 +41,27 @@ def create_forecast_features(df_logs: pd.DataFrame) -> pd.DataFrame:
     daily_data['month'] = daily_data['date'].dt.month
     daily_data['quarter'] = daily_data['date'].dt.quarter
     
-    # Create lag features
+    w = daily_data['waste_tons'].to_numpy(dtype=np.float64)
+
+    # Create lag features straight from the ndarray
     for lag in [1, 7, 30]:
         if len(daily_data) > lag:
-            daily_data[f'waste_lag_{lag}'] = daily_data['waste_tons'].shift(lag)
-    
-    # Rolling averages
+            lagged = np.empty(len(w))
+            lagged[:lag] = np.nan
+            lagged[lag:] = w[:-lag]
+            daily_data[f'waste_lag_{lag}'] = lagged
+
+    # Rolling averages from a single prefix sum: O(N) for all windows
+    # combined, with min_periods=1 semantics from the clipped counts
+    prefix = np.concatenate(([0.0], np.cumsum(w)))
+    positions = np.arange(1, len(w) + 1)
+
     for window in [7, 14, 30]:
         if len(daily_data) >= window:
-            daily_data[f'waste_ma_{window}'] = daily_data['waste_tons'].rolling(
-                window=window, min_periods=1
-            ).mean()
+            counts = np.minimum(positions, window)
+            daily_data[f'waste_ma_{window}'] = (
+                (prefix[positions] - prefix[positions - counts]) / counts
+            )
     
     # Trend features
     daily_data['days_since_start'] = (
@@ -85,7 +94,7 @@ def prepare_sarima_data(features_df: pd.DataFrame) -> pd.Series:
     ts_data = features_df.set_index('date')['waste_tons']
     
     # Handle missing values
-    ts_data = ts_data.fillna(method='ffill').fillna(0)
+    ts_data = ts_data.ffill().fillna(0.0)
     
     return ts_data
 
@@ -124,37 +133,41 @@ def extract_seasonality_patterns(features_df: pd.DataFrame) -> Dict[str, float]:
     if len(features_df) < 30:
         return patterns
     
+    # One extraction of the column and masks instead of a fresh boolean
+    # filter (full scan plus Series allocation) per pattern
+    w = features_df['waste_tons'].to_numpy(dtype=np.float64)
+    weekend_mask = features_df['is_weekend'].to_numpy(dtype=bool)
+    month_start_mask = features_df['is_month_start'].to_numpy(dtype=bool)
+    month_end_mask = features_df['is_month_end'].to_numpy(dtype=bool)
+
+    overall_avg = w.mean()
+
     # Weekend vs weekday pattern
-    weekend_avg = features_df[features_df['is_weekend'] == 1]['waste_tons'].mean()
-    weekday_avg = features_df[features_df['is_weekend'] == 0]['waste_tons'].mean()
-    
-    if weekday_avg > 0:
-        patterns['weekend_factor'] = weekend_avg / weekday_avg
-    
-    # Month start/end patterns
-    month_start_avg = features_df[features_df['is_month_start'] == 1]['waste_tons'].mean()
-    month_end_avg = features_df[features_df['is_month_end'] == 1]['waste_tons'].mean()
-    overall_avg = features_df['waste_tons'].mean()
-    
+    weekday_mask = ~weekend_mask
+    if weekend_mask.any() and weekday_mask.any():
+        weekday_avg = w[weekday_mask].mean()
+        if weekday_avg > 0:
+            patterns['weekend_factor'] = w[weekend_mask].mean() / weekday_avg
+
     if overall_avg > 0:
-        patterns['month_start_factor'] = month_start_avg / overall_avg
-        patterns['month_end_factor'] = month_end_avg / overall_avg
-    
-    # Quarterly patterns
-    for quarter in range(1, 5):
-        quarter_data = features_df[features_df['quarter'] == quarter]['waste_tons']
-        if len(quarter_data) > 0 and overall_avg > 0:
-            patterns['quarterly_factors'][quarter-1] = quarter_data.mean() / overall_avg
-    
+        # Month start/end patterns
+        if month_start_mask.any():
+            patterns['month_start_factor'] = w[month_start_mask].mean() / overall_avg
+        if month_end_mask.any():
+            patterns['month_end_factor'] = w[month_end_mask].mean() / overall_avg
+
+        # Quarterly patterns from a single groupby pass
+        quarter_means = features_df.groupby('quarter')['waste_tons'].mean()
+        for quarter, quarter_mean in quarter_means.items():
+            patterns['quarterly_factors'][int(quarter) - 1] = quarter_mean / overall_avg
+
     return patterns
 
 def create_forecast_dates(last_date: pd.Timestamp, forecast_days: int) -> pd.DatetimeIndex:
     """Create forecast date range"""
     
-    start_date = last_date + pd.Timedelta(days=1)
-    end_date = start_date + pd.Timedelta(days=forecast_days-1)
-    
-    return pd.date_range(start=start_date, end=end_date, freq='D')
+    return pd.date_range(start=last_date + pd.offsets.Day(),
+                         periods=forecast_days, freq='D')
 
 def validate_forecast_inputs(features_df: pd.DataFrame, forecast_days: int) -> bool:
     """Validate inputs for forecasting"""
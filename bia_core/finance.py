@@ -8,6 +8,121 @@ from typing import List, Dict, Any, Tuple
 from bia_core.schemas import FinancialParameters, CashflowItem, NPVResults
 from bia_core import INR_CRORE, CO2_PER_KWH_KG
 
+# Try to import numba, fallback to plain NumPy if not available
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op decorator fallback when numba is not installed"""
+        if args and callable(args[0]):
+            return args[0]
+
+        def wrapper(func):
+            return func
+        return wrapper
+
+@njit(cache=True)
+def _cashflows_kernel(daily_waste_tons, yield_rate, capacity_factor, tariff,
+                      opex_per_ton, fixed_opex, carbon_credit_price,
+                      byproduct_price, byproduct_flag, discount_rate,
+                      horizon_years, growth_rate):
+    """
+    Compute per-year cashflow arrays for the whole project horizon
+
+    Compiled with numba when available; the array math runs in NumPy
+    either way, so the fallback stays vectorized.
+
+    Returns:
+        Tuple of float64 arrays: (waste_tons, kwh, electricity_revenue,
+        carbon_revenue, byproduct_revenue, revenue, opex, ncf, discounted)
+    """
+    t = np.arange(1.0, horizon_years + 1)
+
+    waste_tons = daily_waste_tons * 365 * (1 + growth_rate) ** (t - 1)
+    kwh = waste_tons * yield_rate * capacity_factor
+
+    electricity_revenue = kwh * tariff
+    carbon_revenue = (kwh * CO2_PER_KWH_KG / 1000) * carbon_credit_price
+    byproduct_revenue = waste_tons * 0.3 * byproduct_price * byproduct_flag
+    revenue = electricity_revenue + carbon_revenue + byproduct_revenue
+
+    opex = waste_tons * opex_per_ton + fixed_opex
+    ncf = revenue - opex
+    discounted = ncf / (1 + discount_rate) ** t
+
+    return (waste_tons, kwh, electricity_revenue, carbon_revenue,
+            byproduct_revenue, revenue, opex, ncf, discounted)
+
+def warm_cashflow_kernel():
+    """Trigger JIT compilation of the cashflow kernel with a dummy call"""
+    _cashflows_kernel(1.0, 1.0, 1.0, 1.0, 1.0, 0.0, 0.0, 0.0, 0.0, 0.1, 1, 0.0)
+
+def _annuity_factor(r: float, n: int) -> float:
+    """Closed-form present value factor for a constant annual flow"""
+    if r == 0:
+        return float(n)
+    return (1 - (1 + r) ** (-n)) / r
+
+def _growing_annuity_factor(r: float, g: float, n: int) -> float:
+    """Closed-form present value factor for a flow growing at rate g"""
+    if r == g:
+        return n / (1 + r)
+    ratio = (1 + g) / (1 + r)
+    return (1 - ratio ** n) / (r - g)
+
+# Column order expected by vectorized_npv parameter matrices
+NPV_PARAM_COLUMNS = (
+    'yield_rate', 'capacity_factor', 'tariff', 'opex_per_ton', 'fixed_opex',
+    'capex', 'discount_rate', 'carbon_credit_price', 'byproduct_price',
+    'enable_byproduct'
+)
+
+def vectorized_npv(param_matrix: np.ndarray, daily_waste_tons: float,
+                   horizon_years: int, growth_rate: float = 0.02) -> np.ndarray:
+    """
+    Calculate NPVs for many parameter scenarios in a single NumPy broadcast
+
+    Equivalent to constructing one FinanceCalculator per scenario and calling
+    calculate_npv, but the per-year loop collapses into array math over an
+    (n_scenarios, horizon_years) grid.
+
+    Args:
+        param_matrix: Array of shape (n_scenarios, 10) with columns ordered
+            as NPV_PARAM_COLUMNS (enable_byproduct as 0.0/1.0)
+        daily_waste_tons: Average daily waste in tons
+        horizon_years: Project horizon in years
+        growth_rate: Annual waste growth rate
+
+    Returns:
+        Array of NPVs, one per scenario
+    """
+
+    params = np.atleast_2d(np.asarray(param_matrix, dtype=np.float64))
+    (yield_rate, capacity_factor, tariff, opex_per_ton, fixed_opex,
+     capex, discount_rate, carbon_credit_price, byproduct_price,
+     enable_byproduct) = (params[:, i:i+1] for i in range(len(NPV_PARAM_COLUMNS)))
+
+    # Year axis: shape (1, horizon_years), broadcast against scenario columns
+    t = np.arange(1, horizon_years + 1, dtype=np.float64)[None, :]
+
+    annual_waste_tons = daily_waste_tons * 365 * (1 + growth_rate) ** (t - 1)
+    annual_kwh = annual_waste_tons * yield_rate * capacity_factor
+
+    electricity_revenue = annual_kwh * tariff
+    carbon_revenue = (annual_kwh * CO2_PER_KWH_KG / 1000) * carbon_credit_price
+    byproduct_revenue = annual_waste_tons * 0.3 * byproduct_price * enable_byproduct
+    revenue = electricity_revenue + carbon_revenue + byproduct_revenue
+
+    opex = annual_waste_tons * opex_per_ton + fixed_opex
+    ncf = revenue - opex
+
+    discount = (1 + discount_rate) ** t
+
+    return -capex[:, 0] + (ncf / discount).sum(axis=1)
+
 class FinanceCalculator:
     """Financial calculator for bioenergy projects"""
     
@@ -40,6 +155,10 @@ class FinanceCalculator:
         self.carbon_credit_price = carbon_credit_price
         self.byproduct_price = byproduct_price
         self.enable_byproduct = enable_byproduct
+        # Per-instance memo for the cashflow kernel, keyed on call args;
+        # generate_financial_summary and scenario scans hit it repeatedly
+        self._cashflow_cache: Dict[Tuple[float, int, float],
+                                   Tuple[np.ndarray, ...]] = {}
     
     def calculate_annual_metrics(self, daily_waste_tons: float, year: int, 
                                growth_rate: float = 0.02) -> Dict[str, float]:
@@ -89,113 +208,209 @@ class FinanceCalculator:
             'co2_saved_tons': co2_saved_tons
         }
     
+    def _cashflow_arrays(self, daily_waste_tons: float, horizon_years: int,
+                         growth_rate: float = 0.02) -> Tuple[np.ndarray, ...]:
+        """Run the compiled cashflow kernel and return per-year arrays.
+
+        Results are memoized per instance: payback, ROI, IRR and the
+        environmental metrics all ask for the same arrays, so the summary
+        path pays for one kernel invocation instead of five.
+        """
+        key = (daily_waste_tons, horizon_years, growth_rate)
+        arrays = self._cashflow_cache.get(key)
+
+        if arrays is None:
+            arrays = _cashflows_kernel(
+                daily_waste_tons, self.yield_rate, self.capacity_factor, self.tariff,
+                self.opex_per_ton, self.fixed_opex, self.carbon_credit_price,
+                self.byproduct_price, 1.0 if self.enable_byproduct else 0.0,
+                self.discount_rate, horizon_years, growth_rate
+            )
+            self._cashflow_cache[key] = arrays
+
+        return arrays
+
+    def calculate_cashflow_arrays(self, daily_waste_tons: float, horizon_years: int,
+                                  growth_rate: float = 0.02) -> Tuple[np.ndarray, ...]:
+        """
+        Calculate per-year cashflow arrays for columnar consumers
+
+        Returns:
+            Tuple of float64 arrays: (waste_tons, kwh, electricity_revenue,
+            carbon_revenue, byproduct_revenue, revenue, opex, ncf, discounted)
+        """
+        return self._cashflow_arrays(daily_waste_tons, horizon_years, growth_rate)
+
     def calculate_cashflows(self, daily_waste_tons: float, horizon_years: int,
                         growth_rate: float = 0.02) -> List[Dict[str, float]]:
         """Calculate cashflows for project horizon"""
 
+        (waste_tons, kwh, electricity_revenue, carbon_revenue,
+         byproduct_revenue, revenue, opex, ncf, _) = self._cashflow_arrays(
+            daily_waste_tons, horizon_years, growth_rate
+        )
+
         cashflows = []
 
         for year in range(1, horizon_years + 1):
-            annual_metrics = self.calculate_annual_metrics(
-            daily_waste_tons, year, growth_rate
-            )
-
+            i = year - 1
             cashflow_item = {
             'year': year,
-            'waste_tons': annual_metrics['waste_tons'],
-            'electricity_kwh': annual_metrics['electricity_kwh'],
-            'electricity_revenue': annual_metrics['electricity_revenue'],
-            'carbon_revenue': annual_metrics['carbon_revenue'],
-            'byproduct_revenue': annual_metrics['byproduct_revenue'],
-            'total_revenue': annual_metrics['revenue'],
-            'opex': annual_metrics['total_opex'],
-            'ncf': annual_metrics['ncf']
+            'waste_tons': waste_tons[i],
+            'electricity_kwh': kwh[i],
+            'electricity_revenue': electricity_revenue[i],
+            'carbon_revenue': carbon_revenue[i],
+            'byproduct_revenue': byproduct_revenue[i],
+            'revenue': revenue[i],
+            'total_revenue': revenue[i],
+            'opex': opex[i],
+            'ncf': ncf[i]
             }
 
             cashflows.append(cashflow_item)
 
         return cashflows
 
-    
+
     def calculate_npv(self, daily_waste_tons: float, horizon_years: int,
                       growth_rate: float = 0.02) -> float:
-        """Calculate Net Present Value"""
-        
-        cashflows = self.calculate_cashflows(daily_waste_tons, horizon_years, growth_rate)
-        
-        # Calculate discounted cash flows
-        npv = -self.capex  # Initial investment
-        
-        for cf in cashflows:
-            year = cf['year']
-            discounted_ncf = cf['ncf'] / ((1 + self.discount_rate) ** year)
-            npv += discounted_ncf
-        
-        return npv
-    
+        """Calculate Net Present Value via closed-form annuity factors.
+
+        The yearly cashflow splits into a part that grows with the waste
+        stream (revenue minus variable OPEX) and the constant fixed OPEX,
+        so NPV reduces to two annuity factors instead of a per-year sum.
+        """
+
+        year_one = self.calculate_annual_metrics(daily_waste_tons, 1, growth_rate)
+        growing_ncf = year_one['revenue'] - year_one['variable_opex']
+
+        pv_flows = (growing_ncf * _growing_annuity_factor(
+                        self.discount_rate, growth_rate, horizon_years)
+                    - self.fixed_opex * _annuity_factor(
+                        self.discount_rate, horizon_years))
+
+        return float(-self.capex + pv_flows)
+
+    @classmethod
+    def npv_batch(cls, param_matrix: np.ndarray, daily_waste_tons: float,
+                  horizon_years: int, growth_rate: float = 0.02) -> np.ndarray:
+        """Calculate NPVs for many parameter scenarios in one broadcast.
+
+        Thin wrapper over vectorized_npv for callers that think in terms
+        of the calculator; param_matrix rows follow NPV_PARAM_COLUMNS.
+        """
+        return vectorized_npv(param_matrix, daily_waste_tons,
+                              horizon_years, growth_rate)
+
     def calculate_payback(self, daily_waste_tons: float, horizon_years: int,
                          growth_rate: float = 0.02) -> float:
-        """Calculate payback period in years"""
-        
-        cashflows = self.calculate_cashflows(daily_waste_tons, horizon_years, growth_rate)
-        
-        cumulative_ncf = 0
-        
-        for cf in cashflows:
-            cumulative_ncf += cf['ncf']
-            
-            if cumulative_ncf >= self.capex:
+        """Calculate payback period in years.
+
+        Accumulates yearly net cash flow with scalar arithmetic and
+        returns as soon as capex is recovered, so typical projects touch
+        the first few years instead of materialising the full horizon.
+        """
+
+        # Net cash flow per ton of waste, constant across years
+        ncf_per_ton = (self.yield_rate * self.capacity_factor
+                       * (self.tariff
+                          + CO2_PER_KWH_KG / 1000 * self.carbon_credit_price)
+                       - self.opex_per_ton)
+        if self.enable_byproduct:
+            ncf_per_ton += 0.3 * self.byproduct_price
+
+        cumulative = 0.0
+        growth_mul = 1.0
+
+        for year in range(1, horizon_years + 1):
+            ncf = (daily_waste_tons * 365 * growth_mul * ncf_per_ton
+                   - self.fixed_opex)
+            cumulative += ncf
+
+            if cumulative >= self.capex:
                 # Linear interpolation for more precise payback
-                prev_cumulative = cumulative_ncf - cf['ncf']
-                remaining_recovery = self.capex - prev_cumulative
-                year_fraction = remaining_recovery / cf['ncf']
-                
-                return cf['year'] - 1 + year_fraction
-        
+                return float(year - 1
+                             + (self.capex - (cumulative - ncf)) / ncf)
+
+            growth_mul *= 1.0 + growth_rate
+
         return float('inf')  # Payback not achieved within horizon
-    
+
     def calculate_roi(self, daily_waste_tons: float, horizon_years: int,
                       growth_rate: float = 0.02) -> float:
         """Calculate Return on Investment percentage"""
-        
-        cashflows = self.calculate_cashflows(daily_waste_tons, horizon_years, growth_rate)
-        
-        total_ncf = sum(cf['ncf'] for cf in cashflows)
-        
+
+        ncf = self._cashflow_arrays(daily_waste_tons, horizon_years, growth_rate)[7]
+
+        total_ncf = float(ncf.sum())
+
         if self.capex > 0:
             roi = (total_ncf / self.capex) * 100
         else:
             roi = 0
-        
+
         return roi
-    
+
     def calculate_irr(self, daily_waste_tons: float, horizon_years: int,
                       growth_rate: float = 0.02) -> float:
-        """Calculate Internal Rate of Return using approximation"""
-        
-        cashflows = self.calculate_cashflows(daily_waste_tons, horizon_years, growth_rate)
-        
-        # Simple IRR approximation
-        total_ncf = sum(cf['ncf'] for cf in cashflows)
-        avg_annual_ncf = total_ncf / horizon_years
-        
-        if self.capex > 0:
-            irr_approx = (avg_annual_ncf / self.capex) * 100
-        else:
-            irr_approx = 0
-        
-        return max(0, irr_approx)
+        """Calculate Internal Rate of Return via Newton's method.
+
+        Solves -capex + sum(ncf_t / (1+r)^t) = 0 on the cashflow array;
+        each iteration is one broadcast over the year axis. Falls back
+        to bisection on a wide bracket if Newton does not converge.
+        """
+
+        if self.capex <= 0:
+            return 0.0
+
+        ncf = self._cashflow_arrays(daily_waste_tons, horizon_years, growth_rate)[7]
+        years = np.arange(1.0, horizon_years + 1)
+
+        def npv_at(r: float) -> float:
+            return -self.capex + float(np.dot(ncf, (1.0 + r) ** -years))
+
+        # Warm start from the average-return approximation
+        r = max(float(ncf.sum()) / (self.capex * horizon_years), -0.9)
+
+        for _ in range(12):
+            disc = (1.0 + r) ** -years
+            f = -self.capex + float(np.dot(ncf, disc))
+            f_prime = float(np.dot(ncf, -years * disc / (1.0 + r)))
+
+            if f_prime == 0:
+                break
+
+            r_next = max(r - f / f_prime, -0.99)
+            if abs(r_next - r) < 1e-7:
+                return max(0.0, r_next * 100)
+            r = r_next
+
+        # Bisection fallback; no sign change means no IRR in the bracket
+        lo, hi = -0.99, 5.0
+        f_lo = npv_at(lo)
+        if f_lo * npv_at(hi) > 0:
+            return 0.0
+
+        for _ in range(60):
+            mid = 0.5 * (lo + hi)
+            if npv_at(mid) * f_lo <= 0:
+                hi = mid
+            else:
+                lo = mid
+                f_lo = npv_at(lo)
+
+        return max(0.0, 0.5 * (lo + hi) * 100)
     
     def calculate_environmental_impact(self, daily_waste_tons: float, 
                                      horizon_years: int,
                                      growth_rate: float = 0.02) -> Dict[str, float]:
         """Calculate environmental impact metrics"""
         
-        cashflows = self.calculate_cashflows(daily_waste_tons, horizon_years, growth_rate)
-        
-        # Total electricity generation
-        total_kwh = sum(cf['electricity_kwh'] for cf in cashflows)
-        
+        kwh = self._cashflow_arrays(daily_waste_tons, horizon_years, growth_rate)[1]
+
+        # Total electricity generation as one vectorized reduction
+        total_kwh = float(kwh.sum())
+
         # CO2 savings (kg CO2/kWh)
         co2_savings_kg = total_kwh * CO2_PER_KWH_KG
         co2_savings_tons = co2_savings_kg / 1000
@@ -212,45 +427,37 @@ class FinanceCalculator:
     
     def sensitivity_analysis(self, daily_waste_tons: float, horizon_years: int,
                            parameter_variations: Dict[str, List[float]]) -> Dict[str, List[float]]:
-        """Perform sensitivity analysis on key parameters"""
-        
+        """Perform sensitivity analysis on key parameters.
+
+        Each parameter sweep is one row-block in a scenario matrix fed to
+        vectorized_npv, so the whole grid costs a few broadcasts instead
+        of a fresh calculator and cashflow rebuild per variation.
+        """
+
         results = {}
         base_npv = self.calculate_npv(daily_waste_tons, horizon_years)
-        
+
+        base_row = np.array([
+            self.yield_rate, self.capacity_factor, self.tariff,
+            self.opex_per_ton, self.fixed_opex, self.capex,
+            self.discount_rate, self.carbon_credit_price,
+            self.byproduct_price, 1.0 if self.enable_byproduct else 0.0
+        ], dtype=np.float64)
+
         for param_name, variations in parameter_variations.items():
-            npv_variations = []
-            
-            for variation in variations:
-                # Create modified calculator
-                modified_calc = self._create_modified_calculator(param_name, variation)
-                modified_npv = modified_calc.calculate_npv(daily_waste_tons, horizon_years)
-                npv_variations.append(modified_npv)
-            
-            results[param_name] = npv_variations
-        
+            if param_name not in NPV_PARAM_COLUMNS:
+                # Unknown parameters leave the calculator unchanged
+                results[param_name] = [base_npv] * len(variations)
+                continue
+
+            param_matrix = np.tile(base_row, (len(variations), 1))
+            param_matrix[:, NPV_PARAM_COLUMNS.index(param_name)] = variations
+
+            npvs = vectorized_npv(param_matrix, daily_waste_tons, horizon_years)
+            results[param_name] = npvs.tolist()
+
         return results
-    
-    def _create_modified_calculator(self, param_name: str, value: float) -> 'FinanceCalculator':
-        """Create calculator with modified parameter"""
-        
-        params = {
-            'yield_rate': self.yield_rate,
-            'capacity_factor': self.capacity_factor,
-            'tariff': self.tariff,
-            'opex_per_ton': self.opex_per_ton,
-            'fixed_opex': self.fixed_opex,
-            'capex': self.capex,
-            'discount_rate': self.discount_rate,
-            'carbon_credit_price': self.carbon_credit_price,
-            'byproduct_price': self.byproduct_price,
-            'enable_byproduct': self.enable_byproduct
-        }
-        
-        if param_name in params:
-            params[param_name] = value
-        
-        return FinanceCalculator(**params)
-    
+
     def generate_financial_summary(self, daily_waste_tons: float, horizon_years: int,
                                  growth_rate: float = 0.02) -> Dict[str, Any]:
         """Generate comprehensive financial summary"""
@@ -264,10 +471,10 @@ class FinanceCalculator:
         # Environmental impact
         env_impact = self.calculate_environmental_impact(daily_waste_tons, horizon_years, growth_rate)
         
-        # Cashflow summary
-        cashflows = self.calculate_cashflows(daily_waste_tons, horizon_years, growth_rate)
-        total_revenue = sum(cf['revenue'] for cf in cashflows)
-        total_opex = sum(cf['opex'] for cf in cashflows)
+        # Cashflow summary straight off the memoized arrays
+        arrays = self._cashflow_arrays(daily_waste_tons, horizon_years, growth_rate)
+        total_revenue = float(arrays[5].sum())
+        total_opex = float(arrays[6].sum())
         
         return {
             'financial_metrics': {
@@ -3,22 +3,40 @@ Mapping functionality for bioenergy facilities.
 """
 
 import folium
+import numpy as np
 import pandas as pd
 from typing import Dict, Any, Optional, List
 import streamlit as st
 
-# Default map coordinates for supported cities
+# Default map coordinates for supported cities; tuples so a shared
+# entry can never be mutated by a caller
 CITY_COORDINATES = {
-    'Ahmedabad': [23.0225, 72.5714],
-    'Gandhinagar': [23.2156, 72.6369],
-    'Indore': [22.7196, 75.8577],
-    'Delhi': [28.7041, 77.1025],
-    'Mumbai': [19.0760, 72.8777],
-    'Pune': [18.5204, 73.8567],
-    'Bengaluru': [12.9716, 77.5946],
-    'Chennai': [13.0827, 80.2707]
+    'Ahmedabad': (23.0225, 72.5714),
+    'Gandhinagar': (23.2156, 72.6369),
+    'Indore': (22.7196, 75.8577),
+    'Delhi': (28.7041, 77.1025),
+    'Mumbai': (19.0760, 72.8777),
+    'Pune': (18.5204, 73.8567),
+    'Bengaluru': (12.9716, 77.5946),
+    'Chennai': (13.0827, 80.2707)
 }
 
+# India's centroid, used when a city has no coordinate entry
+_DEFAULT_CENTER = (20.5937, 78.9629)
+
+# Above this many facilities, markers are clustered client-side instead
+# of emitted as individual popup-bearing markers in the page HTML
+MARKER_CLUSTER_THRESHOLD = 300
+
+# Marker color/icon, popup hex color and display label per status; one
+# table lookup replaces the per-row branch ladders
+_STATUS_STYLE = {
+    'operational': ('green', 'play', '#28a745', 'Operational'),
+    'under_construction': ('orange', 'cog', '#fd7e14', 'Under Construction'),
+    'planned': ('blue', 'clock', '#007bff', 'Planned')
+}
+_DEFAULT_STYLE = ('gray', 'question', '#6c757d', 'Unknown')
+
 def create_facilities_map(facilities_df: pd.DataFrame, city: str, 
                          zoom_start: int = 10) -> folium.Map:
     """
@@ -34,11 +52,7 @@ def create_facilities_map(facilities_df: pd.DataFrame, city: str,
     """
     
     # Get city coordinates
-    if city in CITY_COORDINATES:
-        center_coords = CITY_COORDINATES[city]
-    else:
-        # Default to India center if city not found
-        center_coords = [20.5937, 78.9629]
+    center_coords = CITY_COORDINATES.get(city, _DEFAULT_CENTER)
     
     # Create base map
     m = folium.Map(
@@ -47,40 +61,47 @@ def create_facilities_map(facilities_df: pd.DataFrame, city: str,
         tiles='OpenStreetMap'
     )
     
-    # Add facilities as markers
-    if not facilities_df.empty:
-        for idx, facility in facilities_df.iterrows():
+    # Past the threshold, ship bare coordinates and let the browser
+    # cluster them: one JSON array instead of per-marker HTML, which
+    # stops large maps from ballooning or silently failing to render
+    if len(facilities_df) > MARKER_CLUSTER_THRESHOLD:
+        from folium.plugins import FastMarkerCluster
+
+        coords = facilities_df[['lat', 'lon']].to_numpy(dtype=float).tolist()
+        FastMarkerCluster(coords).add_to(m)
+
+    # Add facilities as markers; plain tuple iteration over the raw
+    # column arrays avoids building a typed Series per row
+    elif not facilities_df.empty:
+        columns = ['lat', 'lon', 'name', 'status', 'type', 'capacity_mw',
+                   'city', 'state', 'source']
+        rows = zip(*(facilities_df[col].to_numpy() for col in columns))
+
+        for lat, lon, name, status, ftype, capacity_mw, fcity, state, source in rows:
             try:
                 # Determine marker color based on status
-                status = facility.get('status', 'unknown').lower()
-                if status == 'operational':
-                    color = 'green'
-                    icon = 'play'
-                elif status == 'under_construction':
-                    color = 'orange'
-                    icon = 'cog'
-                elif status == 'planned':
-                    color = 'blue'
-                    icon = 'clock'
-                else:
-                    color = 'gray'
-                    icon = 'question'
-                
+                status = str(status).lower()
+                color, icon = _STATUS_STYLE.get(status, _DEFAULT_STYLE)[:2]
+
                 # Create popup content
-                popup_content = create_facility_popup(facility)
-                
+                popup_content = create_facility_popup({
+                    'name': name, 'type': ftype, 'capacity_mw': capacity_mw,
+                    'status': status, 'city': fcity, 'state': state,
+                    'source': source, 'lat': lat, 'lon': lon
+                })
+
                 # Add marker
                 folium.Marker(
-                    location=[facility['lat'], facility['lon']],
+                    location=[lat, lon],
                     popup=folium.Popup(popup_content, max_width=300),
-                    tooltip=facility['name'],
+                    tooltip=name,
                     icon=folium.Icon(
                         color=color,
                         icon=icon,
                         prefix='fa'
                     )
                 ).add_to(m)
-                
+
             except Exception as e:
                 print(f"Error adding facility marker: {e}")
                 continue
@@ -102,27 +123,18 @@ def create_facilities_map(facilities_df: pd.DataFrame, city: str,
     
     return m
 
-def create_facility_popup(facility: pd.Series) -> str:
-    """Create HTML popup content for facility marker"""
-    
-    # Format capacity
-    capacity = facility.get('capacity_mw', 0)
-    if capacity > 0:
-        capacity_str = f"{capacity:.1f} MW"
-    else:
-        capacity_str = "Not specified"
-    
-    # Create popup HTML
-    popup_html = f"""
+# Popup layout shared by every marker; per-facility values are slotted
+# in with one format_map call instead of rebuilding the HTML per row
+_POPUP_TEMPLATE = """
     <div style="width: 250px;">
         <h4 style="margin: 0 0 10px 0; color: #2E8B57;">
-            {facility.get('name', 'Unknown Facility')}
+            {name}
         </h4>
-        
+
         <table style="width: 100%; font-size: 12px;">
             <tr>
                 <td><strong>Type:</strong></td>
-                <td>{facility.get('type', 'Unknown')}</td>
+                <td>{type}</td>
             </tr>
             <tr>
                 <td><strong>Capacity:</strong></td>
@@ -130,57 +142,56 @@ def create_facility_popup(facility: pd.Series) -> str:
             </tr>
             <tr>
                 <td><strong>Status:</strong></td>
-                <td style="color: {get_status_color(facility.get('status', 'unknown'))};">
-                    {format_status(facility.get('status', 'unknown'))}
+                <td style="color: {status_color};">
+                    {status_label}
                 </td>
             </tr>
             <tr>
                 <td><strong>Location:</strong></td>
-                <td>{facility.get('city', '')}, {facility.get('state', '')}</td>
+                <td>{city}, {state}</td>
             </tr>
             <tr>
                 <td><strong>Source:</strong></td>
-                <td style="font-size: 10px;">{facility.get('source', 'Unknown')}</td>
+                <td style="font-size: 10px;">{source}</td>
             </tr>
         </table>
-        
+
         <div style="margin-top: 10px; font-size: 10px; color: #666;">
-            Coordinates: {facility.get('lat', 0):.4f}, {facility.get('lon', 0):.4f}
+            Coordinates: {lat:.4f}, {lon:.4f}
         </div>
     </div>
     """
-    
-    return popup_html
+
+def create_facility_popup(facility: Dict[str, Any]) -> str:
+    """Create HTML popup content for facility marker"""
+
+    fields = dict(facility)
+
+    # Format capacity
+    capacity = fields.get('capacity_mw', 0)
+    fields['capacity_str'] = f"{capacity:.1f} MW" if capacity > 0 else "Not specified"
+
+    status = str(fields.get('status', 'unknown'))
+    fields['status_color'] = get_status_color(status)
+    fields['status_label'] = format_status(status)
+
+    return _POPUP_TEMPLATE.format_map(fields)
 
 def get_status_color(status: str) -> str:
     """Get color for facility status"""
-    status_colors = {
-        'operational': '#28a745',
-        'under_construction': '#fd7e14',
-        'planned': '#007bff',
-        'unknown': '#6c757d'
-    }
-    
-    return status_colors.get(status.lower(), '#6c757d')
+    return _STATUS_STYLE.get(status.lower(), _DEFAULT_STYLE)[2]
 
 def format_status(status: str) -> str:
     """Format status string for display"""
-    if status.lower() == 'under_construction':
-        return 'Under Construction'
-    elif status.lower() == 'operational':
-        return 'Operational'
-    elif status.lower() == 'planned':
-        return 'Planned'
-    else:
-        return 'Unknown'
+    return _STATUS_STYLE.get(status.lower(), _DEFAULT_STYLE)[3]
 
-def add_map_legend(map_obj: folium.Map):
-    """Add legend to the map"""
-    
-    legend_html = '''
-    <div style="position: fixed; 
-                bottom: 50px; left: 50px; width: 180px; height: 120px; 
-                background-color: white; border:2px solid grey; z-index:9999; 
+# Legend markup is identical for every map, so it lives at module scope;
+# each map still gets its own folium.Element because folium reparents
+# elements and sharing one instance across maps is unsafe
+_LEGEND_HTML = '''
+    <div style="position: fixed;
+                bottom: 50px; left: 50px; width: 180px; height: 120px;
+                background-color: white; border:2px solid grey; z-index:9999;
                 font-size:14px; padding: 10px">
     <h5 style="margin: 0 0 10px 0;">Facility Status</h5>
     <p style="margin: 5px 0;"><i class="fa fa-circle" style="color:green"></i> Operational</p>
@@ -189,8 +200,11 @@ def add_map_legend(map_obj: folium.Map):
     <p style="margin: 5px 0;"><i class="fa fa-circle" style="color:red"></i> City Center</p>
     </div>
     '''
-    
-    map_obj.get_root().html.add_child(folium.Element(legend_html))
+
+def add_map_legend(map_obj: folium.Map):
+    """Add legend to the map"""
+
+    map_obj.get_root().html.add_child(folium.Element(_LEGEND_HTML))
 
 def create_heat_map(facilities_df: pd.DataFrame, city: str) -> folium.Map:
     """Create heat map of facility density"""
@@ -198,7 +212,7 @@ def create_heat_map(facilities_df: pd.DataFrame, city: str) -> folium.Map:
     from folium.plugins import HeatMap
     
     # Get city coordinates
-    center_coords = CITY_COORDINATES.get(city, [20.5937, 78.9629])
+    center_coords = CITY_COORDINATES.get(city, _DEFAULT_CENTER)
     
     # Create base map
     m = folium.Map(
@@ -208,20 +222,10 @@ def create_heat_map(facilities_df: pd.DataFrame, city: str) -> folium.Map:
     )
     
     if not facilities_df.empty:
-        # Prepare heat map data
-        heat_data = []
-        for idx, facility in facilities_df.iterrows():
-            try:
-                # Weight by capacity if available
-                weight = facility.get('capacity_mw', 1)
-                heat_data.append([
-                    facility['lat'], 
-                    facility['lon'], 
-                    weight
-                ])
-            except:
-                continue
-        
+        # Capacity-weighted points in one vectorized extraction
+        heat_data = (facilities_df[['lat', 'lon', 'capacity_mw']]
+                     .to_numpy(dtype=float).tolist())
+
         # Add heat map layer
         if heat_data:
             HeatMap(heat_data).add_to(m)
@@ -242,52 +246,95 @@ def get_facility_statistics(facilities_df: pd.DataFrame) -> Dict[str, Any]:
             'facility_types': {}
         }
     
-    # Basic statistics
-    total_facilities = len(facilities_df)
-    total_capacity = facilities_df['capacity_mw'].sum()
-    avg_capacity = facilities_df['capacity_mw'].mean()
-    
-    # Status counts
-    status_counts = facilities_df['status'].value_counts().to_dict()
-    operational_count = status_counts.get('operational', 0)
-    planned_count = status_counts.get('planned', 0)
-    under_construction_count = status_counts.get('under_construction', 0)
-    
-    # Facility types
-    type_counts = facilities_df['type'].value_counts().to_dict()
-    
+    # Numeric reductions off one extraction of the capacity column
+    capacity = facilities_df['capacity_mw'].to_numpy(dtype=float)
+    total_capacity = float(capacity.sum())
+    avg_capacity = float(capacity.mean()) if capacity.size else 0.0
+
+    # One value_counts per categorical column, indexed by known keys
+    status_counts = facilities_df['status'].value_counts()
+
     return {
-        'total_facilities': total_facilities,
+        'total_facilities': len(facilities_df),
         'total_capacity_mw': total_capacity,
-        'operational_count': operational_count,
-        'planned_count': planned_count,
-        'under_construction_count': under_construction_count,
+        'operational_count': int(status_counts.get('operational', 0)),
+        'planned_count': int(status_counts.get('planned', 0)),
+        'under_construction_count': int(status_counts.get('under_construction', 0)),
         'avg_capacity_mw': avg_capacity,
-        'facility_types': type_counts
+        'facility_types': facilities_df['type'].value_counts().to_dict()
     }
 
-def filter_facilities_by_criteria(facilities_df: pd.DataFrame, 
+def build_spatial_index(facilities_df: pd.DataFrame):
+    """Build a KD-tree over facility coordinates for viewport queries"""
+
+    from scipy.spatial import cKDTree
+
+    return cKDTree(facilities_df[['lat', 'lon']].to_numpy(dtype=float))
+
+def filter_facilities_by_bounds(facilities_df: pd.DataFrame, tree,
+                                min_lat: float, max_lat: float,
+                                min_lon: float, max_lon: float) -> pd.DataFrame:
+    """
+    Facilities inside a lat/lon bounding box via the KD-tree
+
+    Candidates come from one ball query around the box centre, then a
+    precise bbox mask trims the corners — O(log N + k) per viewport
+    change instead of a full-table scan.
+
+    Args:
+        facilities_df: DataFrame the tree was built over
+        tree: KD-tree from build_spatial_index
+        min_lat, max_lat, min_lon, max_lon: Viewport bounds
+
+    Returns:
+        DataFrame of facilities inside the bounds
+    """
+
+    if facilities_df.empty:
+        return facilities_df
+
+    center = ((min_lat + max_lat) / 2, (min_lon + max_lon) / 2)
+    radius = float(np.hypot(max_lat - min_lat, max_lon - min_lon)) / 2
+
+    candidates = tree.query_ball_point(center, radius)
+    if not candidates:
+        return facilities_df.iloc[0:0]
+
+    subset = facilities_df.iloc[candidates]
+    lat = subset['lat'].to_numpy(dtype=float)
+    lon = subset['lon'].to_numpy(dtype=float)
+    inside = ((lat >= min_lat) & (lat <= max_lat)
+              & (lon >= min_lon) & (lon <= max_lon))
+
+    return subset.iloc[np.flatnonzero(inside)]
+
+def filter_facilities_by_criteria(facilities_df: pd.DataFrame,
                                 criteria: Dict[str, Any]) -> pd.DataFrame:
     """Filter facilities based on criteria"""
-    
-    filtered_df = facilities_df.copy()
-    
+
+    # Compose one combined mask and slice once, instead of materialising
+    # an intermediate copy of the table per criterion
+    mask = np.ones(len(facilities_df), dtype=bool)
+
     # Filter by status
     if 'status' in criteria and criteria['status']:
-        filtered_df = filtered_df[filtered_df['status'].isin(criteria['status'])]
-    
+        mask &= facilities_df['status'].isin(criteria['status']).to_numpy()
+
     # Filter by type
     if 'type' in criteria and criteria['type']:
-        filtered_df = filtered_df[filtered_df['type'].isin(criteria['type'])]
-    
+        mask &= facilities_df['type'].isin(criteria['type']).to_numpy()
+
     # Filter by capacity range
     if 'min_capacity' in criteria:
-        filtered_df = filtered_df[filtered_df['capacity_mw'] >= criteria['min_capacity']]
-    
+        mask &= (facilities_df['capacity_mw'] >= criteria['min_capacity']).to_numpy()
+
     if 'max_capacity' in criteria:
-        filtered_df = filtered_df[filtered_df['capacity_mw'] <= criteria['max_capacity']]
-    
-    return filtered_df
+        mask &= (facilities_df['capacity_mw'] <= criteria['max_capacity']).to_numpy()
+
+    if mask.all():
+        return facilities_df
+
+    return facilities_df.iloc[np.flatnonzero(mask)]
 
 @st.cache_data
 def load_facility_data_for_city(city: str) -> pd.DataFrame:
@@ -2,7 +2,9 @@
 Data schemas and models for BIA application using Pydantic.
 """
 
+import pandas as pd
 from pydantic import BaseModel, Field, validator
+from dataclasses import dataclass, field
 from typing import Optional, List
 from datetime import date, datetime
 from bia_core import SUPPORTED_CITIES, WASTE_TYPES
@@ -28,36 +30,36 @@ class UserProfile(BaseModel):
             raise ValueError(f"Waste type must be one of: {', '.join(WASTE_TYPES)}")
         return v
 
-class WasteLog(BaseModel):
-    """Waste log entry data model"""
+@dataclass(slots=True, frozen=True)
+class WasteLog:
+    """Waste log entry.
+
+    A slotted dataclass rather than a Pydantic model: one instance is
+    created per log and the tabs iterate whole histories, so skipping
+    validator dispatch and per-instance __dict__ storage matters here.
+    The range check from the old validator lives in __post_init__.
+    """
     username: str
     date: date
-    waste_tons: float = Field(..., gt=0, le=1000)
-    created_at: Optional[datetime] = Field(default_factory=datetime.now)
-    
-    @validator('waste_tons')
-    def validate_waste_amount(cls, v):
-        if v <= 0:
+    waste_tons: float
+    created_at: datetime = field(default_factory=datetime.now)
+    notes: str = ""
+
+    def __post_init__(self):
+        if self.waste_tons <= 0:
             raise ValueError("Waste amount must be positive")
-        if v > 1000:
+        if self.waste_tons > 1000:
             raise ValueError("Waste amount seems unreasonably high (>1000 tons)")
-        return v
 
 class ForecastInput(BaseModel):
     """Input parameters for forecasting"""
     historical_data: List[float]
     forecast_horizon: int = Field(..., ge=1, le=365)
     growth_rate: Optional[float] = Field(default=0.02, ge=-0.5, le=1.0)
-    
-    @validator('forecast_horizon')
-    def validate_horizon(cls, v):
-        if v < 1 or v > 365:
-            raise ValueError("Forecast horizon must be between 1 and 365 days")
-        return v
 
 class FinancialParameters(BaseModel):
     """Financial calculation parameters"""
-    yield_rate: float = Field(..., gt=0, le=3000)  # kWh/ton
+    yield_rate: float = Field(..., ge=100, le=3000)  # kWh/ton
     capacity_factor: float = Field(..., gt=0, le=1)  # fraction
     tariff: float = Field(..., gt=0, le=20)  # ₹/kWh
     opex_per_ton: float = Field(..., ge=0, le=5000)  # ₹/ton
@@ -65,24 +67,6 @@ class FinancialParameters(BaseModel):
     capex: float = Field(..., gt=0)  # ₹
     discount_rate: float = Field(..., gt=0, le=1)  # fraction
     horizon_years: int = Field(..., ge=1, le=50)
-    
-    @validator('yield_rate')
-    def validate_yield(cls, v):
-        if v < 100 or v > 3000:
-            raise ValueError("Yield rate should be between 100-3000 kWh/ton")
-        return v
-    
-    @validator('capacity_factor')
-    def validate_capacity_factor(cls, v):
-        if v <= 0 or v > 1:
-            raise ValueError("Capacity factor must be between 0 and 1")
-        return v
-    
-    @validator('tariff')
-    def validate_tariff(cls, v):
-        if v <= 0 or v > 20:
-            raise ValueError("Tariff should be between 0-20 ₹/kWh")
-        return v
 
 class FacilityData(BaseModel):
     """Facility information data model"""
@@ -95,29 +79,44 @@ class FacilityData(BaseModel):
     lat: float = Field(..., ge=-90, le=90)
     lon: float = Field(..., ge=-180, le=180)
     source: str
-    
-    @validator('capacity_mw')
-    def validate_capacity(cls, v):
-        if v < 0:
-            raise ValueError("Capacity cannot be negative")
-        return v
 
-class CashflowItem(BaseModel):
-    """Single year cashflow item"""
+def validate_facilities_df(facilities_df: pd.DataFrame) -> pd.DataFrame:
+    """Validate a facilities table in bulk and return the invalid rows.
+
+    Column-level boolean masks check the whole frame at once, which is
+    orders of magnitude faster than looping FacilityData(**row) over a
+    CSV; the Pydantic model remains the validator for single records.
+    """
+
+    if facilities_df.empty:
+        return facilities_df
+
+    invalid = (~facilities_df['lat'].between(-90, 90)
+               | ~facilities_df['lon'].between(-180, 180)
+               | (facilities_df['capacity_mw'] < 0))
+
+    return facilities_df[invalid]
+
+@dataclass(slots=True, frozen=True)
+class CashflowItem:
+    """Single year cashflow item.
+
+    A slotted dataclass: instances are built one per year inside
+    cashflow loops, where Pydantic construction cost would dominate.
+    """
     year: int
     waste_tons: float
     electricity_kwh: float
     revenue: float
     opex: float
     ncf: float  # Net cash flow
-    
-    @validator('year')
-    def validate_year(cls, v):
-        if v < 1:
+
+    def __post_init__(self):
+        if self.year < 1:
             raise ValueError("Year must be positive")
-        return v
 
-class NPVResults(BaseModel):
+@dataclass(slots=True, frozen=True)
+class NPVResults:
     """NPV calculation results"""
     npv: float
     payback_years: float
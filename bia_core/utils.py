@@ -2,6 +2,10 @@
 Utility functions for BIA application.
 """
 
+import math
+from bisect import bisect
+from functools import lru_cache
+
 import pandas as pd
 import numpy as np
 from typing import Any, Dict, List, Optional, Union
@@ -9,28 +13,85 @@ import re
 from datetime import datetime, date
 import json
 
+# Compiled once at import; the functions below run on hot validation
+# and cleaning paths where per-call pattern lookup is measurable
+_WHITESPACE_RE = re.compile(r'\s+')
+_SPECIAL_CHARS_RE = re.compile(r'[^\w\s\-]')
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_NON_DIGIT_RE = re.compile(r'[^\d]')
+
+# Deletion table for ASCII punctuation: a C-level translate pass is
+# several times faster than the regex for the common all-ASCII input
+_DELETE_TABLE = dict.fromkeys(
+    i for i in range(128)
+    if not (chr(i).isalnum() or chr(i) in ' _-'))
+
+# Magnitude buckets for the scalar formatters: one bisect over the
+# bounds indexes straight into (divisor, suffix), replacing the
+# if/elif ladder that branches unpredictably on mixed-scale data
+_CURRENCY_BOUNDS = (1e3, 1e5, 1e7)
+_CURRENCY_SCALE = ((1.0, ''), (1e3, 'K'), (1e5, ' L'), (1e7, ' Cr'))
+_NUMBER_BOUNDS = (1e3, 1e6, 1e9)
+_NUMBER_SCALE = ((1.0, ''), (1e3, 'K'), (1e6, 'M'), (1e9, 'B'))
+
 def format_currency(amount: float, currency: str = "₹") -> str:
     """Format currency with Indian number system"""
-    
+
     if pd.isna(amount) or amount == 0:
         return f"{currency}0"
-    
+
     # Convert to absolute value for formatting
     abs_amount = abs(amount)
     sign = "-" if amount < 0 else ""
-    
+
     # Format based on magnitude
-    if abs_amount >= 1e7:  # Crores
-        formatted = f"{abs_amount/1e7:.1f} Cr"
-    elif abs_amount >= 1e5:  # Lakhs
-        formatted = f"{abs_amount/1e5:.1f} L"
-    elif abs_amount >= 1e3:  # Thousands
-        formatted = f"{abs_amount/1e3:.1f}K"
+    divisor, suffix = _CURRENCY_SCALE[bisect(_CURRENCY_BOUNDS, abs_amount)]
+    if suffix:
+        formatted = f"{abs_amount / divisor:.1f}{suffix}"
     else:
         formatted = f"{abs_amount:.0f}"
-    
+
     return f"{sign}{currency}{formatted}"
 
+def format_currency_array(values: Union[np.ndarray, List[float]],
+                          currency: str = "₹") -> List[str]:
+    """Format an array of currency amounts with Indian number system.
+
+    Vectorized counterpart of format_currency for rendering whole
+    columns: one digitize pass picks the magnitude bucket per value and
+    np.char assembles the strings, instead of a Python branch ladder
+    per element.
+    """
+
+    arr = np.asarray(values, dtype=np.float64)
+
+    if arr.size == 0:
+        return []
+
+    abs_arr = np.abs(arr)
+
+    # Magnitude bucket per value: below thousand, thousands, lakhs, crores
+    idx = np.digitize(abs_arr, [1e3, 1e5, 1e7])
+    divisors = np.array([1.0, 1e3, 1e5, 1e7])[idx]
+    suffixes = np.array(['', 'K', ' L', ' Cr'])[idx]
+
+    scaled = np.char.mod('%.1f', abs_arr / divisors)
+
+    # Sub-thousand values keep the scalar path's integer rendering
+    small = idx == 0
+    if small.any():
+        scaled[small] = np.char.mod('%.0f', abs_arr[small])
+
+    signs = np.where(arr < 0, '-', '')
+    formatted = np.char.add(
+        np.char.add(np.char.add(signs, currency), scaled), suffixes)
+
+    # NaN and zero render the same way as the scalar function
+    formatted = np.where(np.isnan(arr) | (arr == 0),
+                         f"{currency}0", formatted)
+
+    return formatted.tolist()
+
 def format_number(number: float, precision: int = 1) -> str:
     """Format large numbers with K, M, B suffixes"""
     
@@ -39,26 +100,53 @@ def format_number(number: float, precision: int = 1) -> str:
     
     abs_number = abs(number)
     sign = "-" if number < 0 else ""
-    
-    if abs_number >= 1e9:
-        return f"{sign}{abs_number/1e9:.{precision}f}B"
-    elif abs_number >= 1e6:
-        return f"{sign}{abs_number/1e6:.{precision}f}M"
-    elif abs_number >= 1e3:
-        return f"{sign}{abs_number/1e3:.{precision}f}K"
-    else:
-        return f"{sign}{abs_number:.{precision}f}"
 
-def validate_range(value: float, min_val: float, max_val: float, 
+    divisor, suffix = _NUMBER_SCALE[bisect(_NUMBER_BOUNDS, abs_number)]
+    return f"{sign}{abs_number / divisor:.{precision}f}{suffix}"
+
+def format_number_array(values: Union[np.ndarray, List[float]],
+                        precision: int = 1) -> List[str]:
+    """Format an array of numbers with K, M, B suffixes.
+
+    Vectorized counterpart of format_number, same bucketing approach as
+    format_currency_array.
+    """
+
+    arr = np.asarray(values, dtype=np.float64)
+
+    if arr.size == 0:
+        return []
+
+    abs_arr = np.abs(arr)
+
+    idx = np.digitize(abs_arr, [1e3, 1e6, 1e9])
+    divisors = np.array([1.0, 1e3, 1e6, 1e9])[idx]
+    suffixes = np.array(['', 'K', 'M', 'B'])[idx]
+
+    scaled = np.char.mod(f'%.{precision}f', abs_arr / divisors)
+
+    signs = np.where(arr < 0, '-', '')
+    formatted = np.char.add(np.char.add(signs, scaled), suffixes)
+
+    formatted = np.where(np.isnan(arr) | (arr == 0), '0', formatted)
+
+    return formatted.tolist()
+
+def _isna(value: Any) -> bool:
+    """Scalar NA check; pd.isna dispatches through pandas' generic NA
+    machinery and is far slower for plain floats on hot loops"""
+    return value is None or (isinstance(value, float) and value != value)
+
+def validate_range(value: float, min_val: float, max_val: float,
                   param_name: str) -> bool:
     """Validate if value is within acceptable range"""
-    
-    if pd.isna(value):
+
+    if _isna(value):
         return False
-    
+
     if value < min_val or value > max_val:
         return False
-    
+
     return True
 
 def clean_string(text: str) -> str:
@@ -68,50 +156,72 @@ def clean_string(text: str) -> str:
         return str(text)
     
     # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text.strip())
-    
-    # Remove special characters (keep alphanumeric, spaces, hyphens, underscores)
-    text = re.sub(r'[^\w\s\-]', '', text)
-    
+    text = _WHITESPACE_RE.sub(' ', text.strip())
+
+    # Remove special characters (keep alphanumeric, spaces, hyphens,
+    # underscores); str.translate for ASCII, the regex handles the rest
+    if text.isascii():
+        text = text.translate(_DELETE_TABLE)
+    else:
+        text = _SPECIAL_CHARS_RE.sub('', text)
+
     return text
 
 def safe_divide(numerator: float, denominator: float, 
                default: float = 0.0) -> float:
     """Safely divide two numbers, return default if division by zero"""
     
-    if pd.isna(numerator) or pd.isna(denominator):
+    if _isna(numerator) or _isna(denominator):
         return default
-    
+
     if denominator == 0:
         return default
-    
+
     return numerator / denominator
 
 def calculate_percentage_change(old_value: float, new_value: float) -> float:
     """Calculate percentage change between two values"""
     
-    if pd.isna(old_value) or pd.isna(new_value):
+    if _isna(old_value) or _isna(new_value):
         return 0.0
-    
+
     if old_value == 0:
         return 100.0 if new_value > 0 else 0.0
-    
+
     return ((new_value - old_value) / old_value) * 100
 
+# Directional fill methods mapped to their Series accessor names; a
+# dict lookup replaces the per-call elif chain
+_FILL_DISPATCH = {'forward': 'ffill', 'backward': 'bfill'}
+
 def interpolate_missing_values(series: pd.Series, method: str = 'linear') -> pd.Series:
     """Interpolate missing values in a pandas series"""
     
     if series.empty:
         return series
-    
+
     if method == 'linear':
-        return series.interpolate(method='linear')
-    elif method == 'forward':
-        return series.fillna(method='ffill')
-    elif method == 'backward':
-        return series.fillna(method='bfill')
-    else:
-        return series.fillna(0)
+        # Direct np.interp over the non-NaN positions; pandas
+        # interpolate dispatches through SciPy and is far slower
+        arr = series.to_numpy(dtype=np.float64)
+        mask = ~np.isnan(arr)
+
+        if mask.any() and not mask.all():
+            idx = np.arange(arr.size)
+            arr = np.interp(idx, idx[mask], arr[mask])
+
+            # Match pandas: leading NaNs are not back-filled
+            first_valid = int(np.argmax(mask))
+            if first_valid:
+                arr[:first_valid] = np.nan
+
+        return pd.Series(arr, index=series.index, name=series.name)
+
+    fill = _FILL_DISPATCH.get(method)
+    if fill is not None:
+        return getattr(series, fill)()
+
+    return series.fillna(0)
 
 def create_date_range(start_date: Union[str, date], 
                      end_date: Union[str, date],
@@ -125,38 +235,52 @@ def create_date_range(start_date: Union[str, date],
     
     return pd.date_range(start=start_date, end=end_date, freq=freq)
 
-def export_data_to_csv(data: Union[pd.DataFrame, Dict], 
+def export_data_to_csv(data: Union[pd.DataFrame, Dict],
                       filename: str = None) -> str:
-    """Export data to CSV format"""
-    
+    """Export data to CSV format, optionally also writing to a file"""
+
     if isinstance(data, dict):
         df = pd.DataFrame(data)
     else:
-        df = data.copy()
-    
-    return df.to_csv(index=False)
+        # to_csv never mutates its frame, so no defensive copy
+        df = data
+
+    csv_text = df.to_csv(index=False)
+
+    if filename:
+        with open(filename, 'w') as f:
+            f.write(csv_text)
+
+    return csv_text
 
 def export_data_to_json(data: Any, filename: str = None) -> str:
-    """Export data to JSON format"""
-    
+    """Export data to JSON format, optionally also writing to a file"""
+
     if isinstance(data, pd.DataFrame):
-        data_dict = data.to_dict(orient='records')
+        # DataFrame.to_json serializes in C, skipping both the per-row
+        # dict materialization of to_dict('records') and json.dumps'
+        # per-element Python encoder
+        json_text = data.to_json(orient='records', indent=2,
+                                 date_format='iso')
     else:
-        data_dict = data
-    
-    return json.dumps(data_dict, indent=2, default=str)
+        json_text = json.dumps(data, indent=2, default=str)
+
+    if filename:
+        with open(filename, 'w') as f:
+            f.write(json_text)
+
+    return json_text
 
 def validate_email(email: str) -> bool:
     """Validate email format"""
     
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    return _EMAIL_RE.match(email) is not None
 
 def validate_phone(phone: str) -> bool:
     """Validate Indian phone number format"""
     
     # Remove spaces and special characters
-    clean_phone = re.sub(r'[^\d]', '', phone)
+    clean_phone = _NON_DIGIT_RE.sub('', phone)
     
     # Check if it's 10 digits or 10 digits with country code
     if len(clean_phone) == 10:
@@ -166,50 +290,132 @@ def validate_phone(phone: str) -> bool:
     
     return False
 
-def calculate_working_days(start_date: date, end_date: date) -> int:
-    """Calculate number of working days between two dates"""
-    
+def calculate_working_days(start_date: date, end_date: date,
+                           holidays: Optional[List[date]] = None) -> int:
+    """Calculate number of working days between two dates (inclusive)"""
+
     if start_date > end_date:
         return 0
-    
-    date_range = pd.date_range(start=start_date, end=end_date, freq='D')
-    working_days = len([d for d in date_range if d.weekday() < 5])  # Monday=0, Sunday=6
-    
-    return working_days
+
+    # Single C-level weekday count instead of materializing and walking
+    # a date_range; end date is inclusive, hence the one-day bump
+    return int(np.busday_count(
+        np.datetime64(start_date),
+        np.datetime64(end_date) + np.timedelta64(1, 'D'),
+        holidays=holidays if holidays is not None else []
+    ))
 
 def round_to_significant_figures(number: float, sig_figs: int = 3) -> float:
     """Round number to specified significant figures"""
-    
+
     if number == 0:
         return 0
-    
-    return round(number, -int(np.floor(np.log10(abs(number)))) + (sig_figs - 1))
 
-def detect_outliers(series: pd.Series, method: str = 'iqr', 
+    # math.log10/floor stay in C for the scalar case; the numpy pair
+    # allocated ndarray scalars on every call
+    return round(number, -math.floor(math.log10(abs(number))) + (sig_figs - 1))
+
+def round_to_significant_figures_array(values: Union[np.ndarray, List[float]],
+                                       sig_figs: int = 3) -> np.ndarray:
+    """Vectorized counterpart of round_to_significant_figures"""
+
+    arr = np.asarray(values, dtype=np.float64)
+    result = np.zeros_like(arr)
+
+    nonzero = arr != 0
+    if nonzero.any():
+        subset = arr[nonzero]
+        # Per-element decimal places; np.round only takes a scalar, so
+        # scale, round, and scale back instead
+        scale = np.power(10.0, (sig_figs - 1)
+                         - np.floor(np.log10(np.abs(subset))))
+        result[nonzero] = np.round(subset * scale) / scale
+
+    return result
+
+def downsample_lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling for plotting long series
+
+    Args:
+        x: Numeric x values (convert dates to int64 first)
+        y: Series values
+        n_out: Target number of points
+
+    Returns:
+        Indices of the selected points (always keeps first and last)
+    """
+
+    n = len(x)
+
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    indices = np.empty(n_out, dtype=np.intp)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    # Interior bucket boundaries
+    bounds = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = bounds[i], bounds[i + 1]
+
+        # Average of the following bucket (or the final point)
+        if i + 2 < n_out - 1:
+            avg_x = x[bounds[i + 1]:bounds[i + 2]].mean()
+            avg_y = y[bounds[i + 1]:bounds[i + 2]].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+
+        # Pick the bucket point forming the largest triangle
+        bucket_x = x[lo:hi]
+        bucket_y = y[lo:hi]
+        areas = np.abs((x[a] - avg_x) * (bucket_y - y[a]) -
+                       (x[a] - bucket_x) * (avg_y - y[a]))
+
+        a = lo + int(np.argmax(areas))
+        indices[i + 1] = a
+
+    return indices
+
+def detect_outliers(series: pd.Series, method: str = 'iqr',
                    threshold: float = 1.5) -> pd.Series:
     """Detect outliers in a pandas series"""
     
     if series.empty:
         return pd.Series([], dtype=bool)
-    
+
+    # One column extraction; the checks below run on the raw ndarray
+    # instead of dispatching through pandas per statistic
+    values = series.to_numpy(dtype=np.float64)
+
     if method == 'iqr':
-        Q1 = series.quantile(0.25)
-        Q3 = series.quantile(0.75)
-        IQR = Q3 - Q1
-        
-        lower_bound = Q1 - threshold * IQR
-        upper_bound = Q3 + threshold * IQR
-        
-        outliers = (series < lower_bound) | (series > upper_bound)
-        
+        q1, q3 = np.nanquantile(values, [0.25, 0.75])
+        iqr = q3 - q1
+
+        lower_bound = q1 - threshold * iqr
+        upper_bound = q3 + threshold * iqr
+
+        mask = (values < lower_bound) | (values > upper_bound)
+
     elif method == 'zscore':
-        z_scores = np.abs((series - series.mean()) / series.std())
-        outliers = z_scores > threshold
-        
+        mean = np.nanmean(values)
+        std = np.nanstd(values, ddof=1)
+
+        if std == 0 or np.isnan(std):
+            mask = np.zeros(values.size, dtype=bool)
+        else:
+            mask = np.abs(values - mean) / std > threshold
+
     else:
-        outliers = pd.Series([False] * len(series), index=series.index)
-    
-    return outliers
+        mask = np.zeros(values.size, dtype=bool)
+
+    return pd.Series(mask, index=series.index)
 
 def create_summary_statistics(df: pd.DataFrame, 
                             columns: List[str] = None) -> pd.DataFrame:
@@ -217,46 +423,69 @@ def create_summary_statistics(df: pd.DataFrame,
     
     if columns is None:
         columns = df.select_dtypes(include=[np.number]).columns.tolist()
-    
-    summary_stats = []
-    
-    for col in columns:
-        if col in df.columns:
-            stats = {
-                'Column': col,
-                'Count': df[col].count(),
-                'Mean': df[col].mean(),
-                'Std': df[col].std(),
-                'Min': df[col].min(),
-                '25%': df[col].quantile(0.25),
-                '50%': df[col].median(),
-                '75%': df[col].quantile(0.75),
-                'Max': df[col].max(),
-                'Missing': df[col].isna().sum(),
-                'Outliers': detect_outliers(df[col]).sum()
-            }
-            summary_stats.append(stats)
-    
-    return pd.DataFrame(summary_stats)
+    else:
+        columns = [col for col in columns if col in df.columns]
+
+    if not columns:
+        return pd.DataFrame()
+
+    numeric = df[columns]
+
+    # One describe() covers count/mean/std/min/quantiles/max for every
+    # column, replacing ~10 independent scans per column
+    desc = numeric.describe(percentiles=[0.25, 0.5, 0.75]).T
+    missing = numeric.isna().sum()
+
+    # Outlier counts from a single batched quantile call, broadcast
+    # across all columns at once
+    quantiles = numeric.quantile([0.25, 0.75])
+    iqr = quantiles.loc[0.75] - quantiles.loc[0.25]
+    lower = quantiles.loc[0.25] - 1.5 * iqr
+    upper = quantiles.loc[0.75] + 1.5 * iqr
+    outliers = ((numeric < lower) | (numeric > upper)).sum()
+
+    return pd.DataFrame({
+        'Column': desc.index,
+        'Count': desc['count'].astype(int).to_numpy(),
+        'Mean': desc['mean'].to_numpy(),
+        'Std': desc['std'].to_numpy(),
+        'Min': desc['min'].to_numpy(),
+        '25%': desc['25%'].to_numpy(),
+        '50%': desc['50%'].to_numpy(),
+        '75%': desc['75%'].to_numpy(),
+        'Max': desc['max'].to_numpy(),
+        'Missing': missing.to_numpy(),
+        'Outliers': outliers.to_numpy()
+    })
+
+@lru_cache(maxsize=128)
+def _color_palette_cached(n_colors: int, palette: str) -> tuple:
+    """Build the hex palette once per (n_colors, palette) pair"""
 
-def generate_color_palette(n_colors: int, palette: str = 'viridis') -> List[str]:
-    """Generate color palette for visualizations"""
-    
     import matplotlib.pyplot as plt
-    
+
     if palette in plt.colormaps():
         cmap = plt.get_cmap(palette)
         colors = [cmap(i / (n_colors - 1)) for i in range(n_colors)]
         # Convert to hex
-        hex_colors = ['#%02x%02x%02x' % (int(r*255), int(g*255), int(b*255)) 
-                     for r, g, b, a in colors]
-        return hex_colors
+        return tuple('#%02x%02x%02x' % (int(r*255), int(g*255), int(b*255))
+                     for r, g, b, a in colors)
     else:
         # Default colors
-        default_colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', 
-                         '#9467bd', '#8c564b', '#e377c2', '#7f7f7f', 
+        default_colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728',
+                         '#9467bd', '#8c564b', '#e377c2', '#7f7f7f',
                          '#bcbd22', '#17becf']
-        return (default_colors * (n_colors // len(default_colors) + 1))[:n_colors]
+        return tuple((default_colors * (n_colors // len(default_colors) + 1))[:n_colors])
+
+def generate_color_palette(n_colors: int, palette: str = 'viridis') -> List[str]:
+    """Generate color palette for visualizations.
+
+    Palettes are deterministic in (n_colors, palette) and requested on
+    every dashboard re-render, so the build is memoized; repeat calls
+    never touch matplotlib.
+    """
+
+    return list(_color_palette_cached(n_colors, palette))
 
 def log_performance(func_name: str, execution_time: float, 
                    data_size: int = None) -> Dict[str, Any]:
@@ -283,40 +512,62 @@ def create_backup_filename(base_name: str, extension: str = '.csv') -> str:
     return f"{clean_base}_backup_{timestamp}{extension}"
 
 class ConfigManager:
-    """Simple configuration manager"""
-    
+    """Simple configuration manager.
+
+    Keeps a flat dotted-key mirror of the nested config so get() is a
+    single dict lookup instead of a split-and-walk per read; the mirror
+    is maintained incrementally on set() and rebuilt on from_dict().
+    """
+
     def __init__(self, config_dict: Dict[str, Any] = None):
         self.config = config_dict or {}
-    
+        self._flat = self._flatten(self.config)
+
+    @staticmethod
+    def _flatten(config: Dict[str, Any], prefix: str = '') -> Dict[str, Any]:
+        """Map every dotted path in the tree to its value"""
+        flat = {}
+        for k, v in config.items():
+            dotted = f"{prefix}{k}"
+            flat[dotted] = v
+            if isinstance(v, dict):
+                flat.update(ConfigManager._flatten(v, f"{dotted}."))
+        return flat
+
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value"""
-        keys = key.split('.')
-        value = self.config
-        
-        for k in keys:
-            if isinstance(value, dict) and k in value:
-                value = value[k]
-            else:
-                return default
-        
-        return value
-    
+        return self._flat.get(key, default)
+
     def set(self, key: str, value: Any):
         """Set configuration value"""
         keys = key.split('.')
         config = self.config
-        
+
+        path = ''
         for k in keys[:-1]:
             if k not in config:
                 config[k] = {}
             config = config[k]
-        
+            path = f"{path}{k}."
+            self._flat[path[:-1]] = config
+
         config[keys[-1]] = value
-    
+
+        # Refresh the mirror for this subtree only: drop stale
+        # descendants of an overwritten branch, then re-flatten
+        subtree_prefix = f"{key}."
+        for stale in [fk for fk in self._flat if fk.startswith(subtree_prefix)]:
+            del self._flat[stale]
+
+        self._flat[key] = value
+        if isinstance(value, dict):
+            self._flat.update(self._flatten(value, subtree_prefix))
+
     def to_dict(self) -> Dict[str, Any]:
         """Export configuration as dictionary"""
         return self.config.copy()
-    
+
     def from_dict(self, config_dict: Dict[str, Any]):
         """Import configuration from dictionary"""
         self.config = config_dict.copy()
+        self._flat = self._flatten(self.config)
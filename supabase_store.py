@@ -5,11 +5,15 @@ Uses SQLAlchemy with DATABASE_URL from environment secrets.
 
 import os
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, date
-from typing import List, Optional
-from sqlalchemy import create_engine, text, Column, String, Float, Date, DateTime, Boolean, Integer
+from typing import Dict, List, Optional
+from sqlalchemy import create_engine, select, text, Column, String, Float, Date, DateTime, Boolean, Integer, Index, UniqueConstraint
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.orm import sessionmaker
 from bia_core.schemas import UserProfile, WasteLog
 import bcrypt
 
@@ -31,7 +35,7 @@ class User(Base):
 
 class WasteLogEntry(Base):
     __tablename__ = 'waste_logs'
-    
+
     id = Column(String(50), primary_key=True)  # Will use UUID or composite key
     username = Column(String(50), nullable=False)
     date = Column(Date, nullable=False)
@@ -39,23 +43,47 @@ class WasteLogEntry(Base):
     notes = Column(String(500), default="")
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    # (username, date) is the logical key: it is the ON CONFLICT target
+    # of the upsert in add_waste_log, and the composite index turns both
+    # that probe and get_user_logs' ordered scan into index seeks
+    __table_args__ = (
+        UniqueConstraint('username', 'date', name='uq_user_date'),
+        Index('idx_user_date', 'username', 'date')
+    )
+
 # Database connection
 DATABASE_URL = os.environ.get('DATABASE_URL')
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL environment variable is required")
 
-# Create engine and session
-engine = create_engine(DATABASE_URL)
+# Create engine and session. Sessions borrow pooled connections
+# instead of paying a TCP+TLS handshake per call; pre-ping and recycle
+# keep long-idle connections from surfacing as stale-socket errors.
+engine = create_engine(
+    DATABASE_URL,
+    pool_size=5,
+    max_overflow=10,
+    pool_pre_ping=True,
+    pool_recycle=1800
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-def get_db() -> Session:
-    """Get database session"""
+@contextmanager
+def session_scope():
+    """Provide a session that commits on success and always closes.
+
+    The old get_db()/close() pattern leaked sessions on the exception
+    paths; this guarantees rollback and close.
+    """
     db = SessionLocal()
     try:
-        return db
-    except Exception as e:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
         db.close()
-        raise e
 
 def migrate():
     """Create tables if they don't exist"""
@@ -86,32 +114,77 @@ def migrate():
         logger.error(f"Migration error: {e}")
         return False
 
+# bcrypt cost parameter, overridable per deployment; hashing runs on a
+# worker thread (bcrypt releases the GIL) so the existence SELECT in
+# add_user overlaps with the ~200 ms hash instead of following it
+BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', '12'))
+_HASH_POOL = ThreadPoolExecutor(max_workers=2)
+
+def _hash_password(password: str) -> str:
+    return bcrypt.hashpw(password.encode('utf-8'),
+                         bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode('utf-8')
+
+# User rows cached for a short TTL so repeat login attempts skip the
+# SELECT; bcrypt.checkpw still runs on every call. Size-bounded the
+# same way as the backtest cache in bia_core.models: cleared wholesale
+# at the limit rather than tracking LRU order.
+_USER_CACHE: Dict[str, tuple] = {}
+_USER_CACHE_TTL = 60.0
+_USER_CACHE_LIMIT = 1024
+
+def _get_user_row(username: str) -> Optional[tuple]:
+    """Fetch (password_hash, entity_name, city, waste_type), cached"""
+
+    cached = _USER_CACHE.get(username)
+    if cached is not None and time.monotonic() - cached[0] < _USER_CACHE_TTL:
+        return cached[1]
+
+    with session_scope() as db:
+        user = db.query(User).filter(User.username == username).first()
+        if not user:
+            return None
+
+        row = (
+            getattr(user, 'password_hash'),
+            getattr(user, 'entity_name'),
+            getattr(user, 'city'),
+            getattr(user, 'waste_type')
+        )
+
+    if len(_USER_CACHE) >= _USER_CACHE_LIMIT:
+        _USER_CACHE.clear()
+    _USER_CACHE[username] = (time.monotonic(), row)
+
+    return row
+
 def add_user(username: str, password: str, entity_name: str, city: str, waste_type: str) -> bool:
     """Add a new user to the database"""
     try:
-        db = get_db()
-        
-        # Check if user already exists
-        existing_user = db.query(User).filter(User.username == username).first()
-        if existing_user:
-            db.close()
-            return False
-        
-        # Hash password
-        password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-        
-        # Create new user
-        new_user = User()
-        setattr(new_user, 'username', username)
-        setattr(new_user, 'password_hash', password_hash)
-        setattr(new_user, 'entity_name', entity_name)
-        setattr(new_user, 'city', city)
-        setattr(new_user, 'waste_type', waste_type)
-        
-        db.add(new_user)
-        db.commit()
-        db.close()
-        
+        # Start hashing before touching the DB so the round-trip below
+        # overlaps the CPU-bound bcrypt work
+        hash_future = _HASH_POOL.submit(_hash_password, password)
+
+        with session_scope() as db:
+            # Check if user already exists
+            existing_user = db.query(User).filter(User.username == username).first()
+            if existing_user:
+                return False
+
+            password_hash = hash_future.result()
+
+            # Create new user
+            new_user = User()
+            setattr(new_user, 'username', username)
+            setattr(new_user, 'password_hash', password_hash)
+            setattr(new_user, 'entity_name', entity_name)
+            setattr(new_user, 'city', city)
+            setattr(new_user, 'waste_type', waste_type)
+
+            db.add(new_user)
+
+        # A stale negative/old entry must not outlive the insert
+        _USER_CACHE.pop(username, None)
+
         logger.info(f"User {username} added successfully")
         return True
         
@@ -119,98 +192,165 @@ def add_user(username: str, password: str, entity_name: str, city: str, waste_ty
         logger.error(f"Error adding user {username}: {e}")
         return False
 
+def bulk_add_users(users: List[Dict]) -> List[str]:
+    """Register many users in one statement; returns rejected usernames.
+
+    Each user dict needs 'username', 'password', 'entity_name', 'city'
+    and 'waste_type'. Password hashes are computed in parallel (bcrypt
+    releases the GIL), then a single INSERT ... ON CONFLICT DO NOTHING
+    inserts every row; usernames already taken come back as rejected.
+    """
+    if not users:
+        return []
+
+    try:
+        # Hash across cores first: N serial bcrypt calls at 12 rounds
+        # would dominate the whole batch
+        with ThreadPoolExecutor(max_workers=min(len(users), os.cpu_count() or 4)) as pool:
+            hashes = list(pool.map(_hash_password,
+                                   [user['password'] for user in users]))
+
+        rows = [{
+            'username': user['username'],
+            'password_hash': password_hash,
+            'entity_name': user['entity_name'],
+            'city': user['city'],
+            'waste_type': user['waste_type']
+        } for user, password_hash in zip(users, hashes)]
+
+        stmt = (
+            pg_insert(User).values(rows)
+            .on_conflict_do_nothing(index_elements=['username'])
+            .returning(User.username)
+        )
+
+        with session_scope() as db:
+            accepted = {row[0] for row in db.execute(stmt)}
+
+        for username in accepted:
+            _USER_CACHE.pop(username, None)
+
+        rejected = [user['username'] for user in users
+                    if user['username'] not in accepted]
+
+        logger.info(f"Bulk added {len(accepted)} users, {len(rejected)} rejected")
+        return rejected
+
+    except Exception as e:
+        logger.error(f"Error bulk adding users: {e}")
+        return [user['username'] for user in users]
+
 def validate_user(username: str, password: str) -> Optional[UserProfile]:
     """Validate user credentials and return user profile"""
     try:
-        db = get_db()
-        
-        user = db.query(User).filter(User.username == username).first()
-        if not user:
-            db.close()
+        row = _get_user_row(username)
+        if row is None:
             return None
-        
-        # Verify password
-        if bcrypt.checkpw(password.encode('utf-8'), getattr(user, 'password_hash').encode('utf-8')):
-            profile = UserProfile(
-                username=getattr(user, 'username'),
+
+        password_hash, entity_name, city, waste_type = row
+
+        # Verify password; always runs, even on a cache hit
+        if bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8')):
+            return UserProfile(
+                username=username,
                 password_hash='[PROTECTED]',  # Don't expose real hash
-                entity_name=getattr(user, 'entity_name'),
-                city=getattr(user, 'city'),
-                waste_type=getattr(user, 'waste_type').lower()  # Ensure lowercase
+                entity_name=entity_name,
+                city=city,
+                waste_type=waste_type.lower()  # Ensure lowercase
             )
-            db.close()
-            return profile
-        
-        db.close()
+
         return None
         
     except Exception as e:
         logger.error(f"Error validating user {username}: {e}")
         return None
 
+def _waste_log_upsert(rows: List[Dict]):
+    """Build a single-statement insert that updates on (username, date)"""
+    stmt = pg_insert(WasteLogEntry).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=['username', 'date'],
+        set_={
+            'waste_tons': stmt.excluded.waste_tons,
+            'notes': stmt.excluded.notes
+        }
+    )
+
 def add_waste_log(username: str, log_date: date, waste_tons: float, notes: str = "") -> bool:
-    """Add a waste log entry"""
+    """Add or update a waste log entry"""
     try:
-        db = get_db()
-        
-        # Create unique ID (username + date)
-        log_id = f"{username}_{log_date.isoformat()}"
-        
-        # Check if log already exists for this date
-        existing_log = db.query(WasteLogEntry).filter(
-            WasteLogEntry.username == username,
-            WasteLogEntry.date == log_date
-        ).first()
-        
-        if existing_log:
-            # Update existing log  
-            db.query(WasteLogEntry).filter(
-                WasteLogEntry.username == username,
-                WasteLogEntry.date == log_date
-            ).update({
+        with session_scope() as db:
+            # Native upsert: one round-trip instead of SELECT then
+            # INSERT-or-UPDATE, keyed on the UNIQUE(username, date) constraint
+            db.execute(_waste_log_upsert([{
+                'id': f"{username}_{log_date.isoformat()}",
+                'username': username,
+                'date': log_date,
                 'waste_tons': waste_tons,
                 'notes': notes
-            })
-            logger.info(f"Updated waste log for {username} on {log_date}")
-        else:
-            # Create new log
-            new_log = WasteLogEntry()
-            setattr(new_log, 'id', log_id)
-            setattr(new_log, 'username', username)
-            setattr(new_log, 'date', log_date)
-            setattr(new_log, 'waste_tons', waste_tons)
-            setattr(new_log, 'notes', notes)
-            db.add(new_log)
-            logger.info(f"Added new waste log for {username} on {log_date}")
-        
-        db.commit()
-        db.close()
+            }]))
+
+        logger.info(f"Upserted waste log for {username} on {log_date}")
         return True
-        
+
     except Exception as e:
         logger.error(f"Error adding waste log for {username}: {e}")
         return False
 
+# Rows per statement for bulk ingestion
+_BULK_CHUNK_SIZE = 1000
+
+def bulk_add_waste_logs(logs: List[Dict]) -> bool:
+    """Add or update many waste logs in chunked single statements.
+
+    Each log dict needs 'username', 'date' and 'waste_tons'; 'notes' is
+    optional. All chunks commit in one transaction.
+    """
+    if not logs:
+        return True
+
+    try:
+        with session_scope() as db:
+            for start in range(0, len(logs), _BULK_CHUNK_SIZE):
+                chunk = logs[start:start + _BULK_CHUNK_SIZE]
+                rows = [{
+                    'id': f"{log['username']}_{log['date'].isoformat()}",
+                    'username': log['username'],
+                    'date': log['date'],
+                    'waste_tons': log['waste_tons'],
+                    'notes': log.get('notes', '')
+                } for log in chunk]
+                db.execute(_waste_log_upsert(rows))
+
+        logger.info(f"Bulk upserted {len(logs)} waste logs")
+        return True
+
+    except Exception as e:
+        logger.error(f"Error bulk adding waste logs: {e}")
+        return False
+
 def get_user_logs(username: str) -> List[WasteLog]:
     """Get all waste logs for a user"""
     try:
-        db = get_db()
-        
-        logs = db.query(WasteLogEntry).filter(
-            WasteLogEntry.username == username
-        ).order_by(WasteLogEntry.date.desc()).all()
-        
-        result = []
-        for log in logs:
-            waste_log = WasteLog(
-                username=getattr(log, 'username'),
-                date=getattr(log, 'date'),
-                waste_tons=getattr(log, 'waste_tons'),
-                notes=getattr(log, 'notes', '') or ""
-            )
-            result.append(waste_log)
-        
-        db.close()
+        # Core select of just the needed columns: rows come back as
+        # plain tuples, skipping ORM instrumentation and the identity
+        # map for what is a read-only copy into WasteLog dataclasses
+        stmt = (
+            select(WasteLogEntry.username, WasteLogEntry.date,
+                   WasteLogEntry.waste_tons, WasteLogEntry.notes)
+            .where(WasteLogEntry.username == username)
+            .order_by(WasteLogEntry.date.desc())
+        )
+
+        with session_scope() as db:
+            rows = db.execute(stmt).all()
+
+        result = [
+            WasteLog(username=user, date=log_date,
+                     waste_tons=waste_tons, notes=notes or "")
+            for user, log_date, waste_tons, notes in rows
+        ]
+
         logger.info(f"Retrieved {len(result)} logs for {username}")
         return result
         
@@ -245,6 +385,7 @@ CREATE TABLE IF NOT EXISTS waste_logs (
 -- Indexes for better performance
 CREATE INDEX IF NOT EXISTS idx_waste_logs_username ON waste_logs(username);
 CREATE INDEX IF NOT EXISTS idx_waste_logs_date ON waste_logs(date);
+CREATE INDEX IF NOT EXISTS idx_user_date ON waste_logs(username, date);
 """
 
 if __name__ == "__main__":